@@ -1,126 +1,64 @@
-import pygame
 import sys
 import numpy as np
 
+from lazy_import import LazyModule
+from solver import Node, SearchObserver, Solver
+
+# loaded on first use: searching with PathFinder needs no display
+pygame = LazyModule('pygame')
+
 # options
 CELL_WIDTH = 16
 CELL_HEIGHT = 16
 MENU_WIDTH = 250
 
 
-class Node:
-    def __init__(self, parent=None, position=None):
-        self.parent = parent
-        self.position = position
-
-        self.g = 0.0
-        self.h = 0.0
-        self.f = 0.0
-
-    def __eq__(self, other):
-        return self.position == other.position
-
-
-class PathFinder:
-    def __init__(self, matrix, win):
-        self.matrix = matrix
+class Visualizer(SearchObserver):
+    def __init__(self, win, start, end):
         self.win = win
-
-    def create_path(self, start, end):
         self.start = start
         self.end = end
-        start_node = Node(None, start)
-        end_node = Node(None, end)
-        open_list = []
-        closed_list = []
-
-        open_list.append(start_node)
-
-        while len(open_list) > 0:
-            current_node = min(open_list, key=lambda node: node.f)
-            current_index = open_list.index(current_node)
-
-            open_list.pop(current_index)
-            closed_list.append(current_node)
-            self.visualize_lists(open_list, closed_list)
-
-            if current_node == end_node:
-                path = []
-                current = current_node
-                while current is not None:
-                    path.append(current.position)
-                    self.visualize_path(path)
-                    current = current.parent
-                return path[::-1]
-
-            for new_position in [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                node_position = (
-                    current_node.position[0] + new_position[0], current_node.position[1] + new_position[1])
-
-                if node_position[0] > (len(self.matrix) - 1) or node_position[0] < 0 or node_position[1] > (len(self.matrix[0]) - 1) or node_position[1] < 0:
-                    continue
-
-                if self.matrix[node_position[0]][node_position[1]] != 1:
-                    continue
-
-                if node_position in [node.position for node in closed_list]:
-                    continue
-
-                new_node = Node(current_node, node_position)
-                new_node.g = new_node.parent.g + np.sqrt(((new_node.position[0] - new_node.parent.position[0])**2) + (
-                    (new_node.position[1] - new_node.parent.position[1]))**2)
-                new_node.h = np.sqrt(((new_node.position[0] - end_node.position[0]) ** 2) + (
-                    (new_node.position[1] - end_node.position[1]) ** 2))
-
-                new_node.f = new_node.g + new_node.h
-
-                if new_node.position not in [node.position for node in open_list]:
-                    open_list.append(new_node)
-                    self.visualize_lists(open_list, closed_list)
-                else:
-                    node_in = [
-                        node for node in open_list if node.position == new_node.position]
-                    if node_in[0].f > new_node.f:
-                        open_list.remove(node_in[0])
-                        open_list.append(new_node)
-                        self.visualize_lists(open_list, closed_list)
-
-    def visualize_path(self, path):
-        if path:
-            color = (255, 80, 255)
-            for path in path[1:-1]:
-                x_pos = MENU_WIDTH + path[1] * CELL_WIDTH + 1
-                y_pos = path[0] * CELL_HEIGHT + 1
-
-                pygame.draw.rect(self.win, color, (x_pos, y_pos,
-                                 CELL_WIDTH - 2, CELL_HEIGHT - 2))
-
-            pygame.display.update()
-            pygame.time.delay(100)
-
-    def visualize_lists(self, open_list, closed_list):
-        if open_list:
-            color = (0, 120, 255)
-            for item in open_list:
-                if item.position != self.start and item.position != self.end:
-                    x_pos = MENU_WIDTH + item.position[1] * CELL_WIDTH + 1
-                    y_pos = item.position[0] * CELL_HEIGHT + 1
 
-                    pygame.draw.rect(
-                        self.win, color, (x_pos, y_pos, CELL_WIDTH - 2, CELL_HEIGHT - 2))
-
-        if closed_list:
-            color = (0, 255, 50)
-            for item in closed_list:
-                if item.position != self.start and item.position != self.end:
-                    x_pos = MENU_WIDTH + item.position[1] * CELL_WIDTH + 1
-                    y_pos = item.position[0] * CELL_HEIGHT + 1
-
-                    pygame.draw.rect(
-                        self.win, color, (x_pos, y_pos, CELL_WIDTH - 2, CELL_HEIGHT - 2))
+    def node_opened(self, position):
+        self.draw_node(position, (0, 120, 255))
+
+    def node_closed(self, position):
+        self.draw_node(position, (0, 255, 50))
+
+    def path_found(self, path):
+        # draw the whole path in one update; game.Game animates it frame by frame
+        # without holding up the event loop
+        color = (255, 80, 255)
+        rects = []
+        for position in reversed(path[1:-1]):
+            x_pos = MENU_WIDTH + position[1] * CELL_WIDTH + 1
+            y_pos = position[0] * CELL_HEIGHT + 1
+            rects.append(pygame.draw.rect(
+                self.win, color, (x_pos, y_pos, CELL_WIDTH - 2, CELL_HEIGHT - 2)))
+        pygame.display.update(rects)
+
+    def draw_node(self, position, color):
+        if position != self.start and position != self.end:
+            x_pos = MENU_WIDTH + position[1] * CELL_WIDTH + 1
+            y_pos = position[0] * CELL_HEIGHT + 1
+
+            rect = pygame.draw.rect(
+                self.win, color, (x_pos, y_pos, CELL_WIDTH - 2, CELL_HEIGHT - 2))
+            pygame.display.update(rect)
+
+
+class PathFinder(Solver):
+    # draws its progress on win when given one, otherwise searches headless.
+    # Paths cost the same as the old list-based search found, but where several
+    # paths tie the heap may pick a different one
+    def __init__(self, matrix, win=None):
+        super().__init__(matrix)
+        self.win = win
 
-        pygame.display.update()
-        # pygame.time.delay(100)
+    def create_path(self, start, end):
+        if self.win is not None:
+            self.observer = Visualizer(self.win, start, end)
+        return super().create_path(start, end)
 
 
 class Game:
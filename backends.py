@@ -0,0 +1,330 @@
+import importlib.util
+import math
+import time
+
+import numpy as np
+
+from bidirectional import BidirectionalSolver
+from distance_field import FieldCache
+from hpa import HierarchicalPlanner
+from jps import JumpPointSolver
+from line_of_sight import LineOfSight
+from lpa_star import IncrementalPlanner
+from search_stats import SearchStats
+from solver import Solver
+from theta_star import ThetaStarSolver
+from weighted import HeapWeightedSolver, WeightedSolver
+
+BACKENDS = {}
+
+
+class SearchResult:
+    def __init__(self, path, cost, expanded, elapsed, stats=None):
+        # path is a list of (row, col) cells, None when the end is unreachable;
+        # stats is the SearchStats of the search, when it ran one
+        self.path = path
+        self.cost = cost
+        self.expanded = expanded
+        self.elapsed = elapsed
+        self.stats = stats
+
+    @property
+    def found(self):
+        return self.path is not None
+
+    def __repr__(self):
+        length = len(self.path) if self.path else 0
+        return (f'SearchResult(found={self.found}, length={length}, cost={self.cost}, '
+                f'expanded={self.expanded}, elapsed={self.elapsed:.6f})')
+
+
+def register_backend(name):
+    def register(cls):
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return register
+
+
+def available_backends():
+    return sorted(BACKENDS)
+
+
+def installed_backends():
+    # the backends whose optional package, if they need one, can be imported
+    return [name for name in available_backends()
+            if BACKENDS[name].requires is None or importlib.util.find_spec(BACKENDS[name].requires)]
+
+
+def backend_class(name, smooth=False):
+    # the class registered as name, checked like get_backend checks it, for
+    # callers that build the backend later
+    if name not in BACKENDS:
+        raise ValueError(f'unknown backend {name!r}, expected one of {available_backends()}')
+    if smooth and BACKENDS[name].weighted:
+        raise ValueError(f'backend {name!r} costs terrain, which straight lines ignore')
+    return BACKENDS[name]
+
+
+def get_backend(name, matrix, smooth=False, **options):
+    # with smooth set, every path is cut down to the waypoints where it turns
+    backend = backend_class(name, smooth)(matrix, **options)
+    if smooth:
+        backend.sight = LineOfSight(matrix)
+    return backend
+
+
+def backend_matrix(name, matrix, weighted=False):
+    # the cells to build backend name on: weighted backends take terrain weights
+    # as they are, the others only whether a cell can be entered
+    if weighted and not BACKENDS[name].weighted:
+        return (np.asarray(matrix) > 0).view(np.uint8)
+    return matrix
+
+
+class Backend:
+    # a backend wraps one engine built for one matrix; subclasses implement find()
+    name = None
+    incremental = False
+    # weighted backends take terrain weights (0 blocked) instead of a 0/1 matrix
+    weighted = False
+    # any-angle backends cut corners between waypoints, so their costs beat grid paths
+    any_angle = False
+    # optional package the backend imports when it is built
+    requires = None
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        # called with the SearchStats of every search, e.g. a search_stats.LogSink
+        self.stats_sink = None
+        # line-of-sight tests when paths are smoothed, see get_backend
+        self.sight = None
+
+    def set_matrix(self, matrix):
+        # for incremental backends after wall edits; line of sight follows the new walls
+        self.matrix = matrix
+        if self.sight is not None:
+            self.sight = LineOfSight(matrix)
+
+    def find(self, start, end):
+        raise NotImplementedError
+
+    def find_stats(self, expanded, elapsed):
+        # stats of the last find(); engines that keep no counters report the
+        # expansions and the whole time as search
+        stats = SearchStats(expanded=expanded)
+        stats.times['search'] = elapsed
+        return stats
+
+    def free(self, cell):
+        value = self.matrix[cell[0]][cell[1]]
+        return value > 0 if self.weighted else value == 1
+
+    def unreachable(self):
+        # the result of a query that is not searched, e.g. one from or to a wall
+        stats = Backend.find_stats(self, 0, 0.0)
+        if self.stats_sink is not None:
+            self.stats_sink(stats)
+        return SearchResult(None, None, 0, 0.0, stats)
+
+    def search(self, start, end):
+        start = tuple(start)
+        end = tuple(end)
+        if not (self.free(start) and self.free(end)):
+            return self.unreachable()
+        started = time.perf_counter()
+        path, cost, expanded = self.find(start, end)
+        elapsed = time.perf_counter() - started
+        return self.result(path, cost, expanded, elapsed)
+
+    def result(self, path, cost, expanded, elapsed):
+        stats = self.find_stats(expanded, elapsed)
+        if self.sight is not None and path:
+            started = time.perf_counter()
+            path = self.sight.smooth(path)
+            cost = path_cost(path)
+            stats.times['smooth'] = time.perf_counter() - started
+            elapsed += stats.times['smooth']
+        if self.stats_sink is not None:
+            self.stats_sink(stats)
+        return SearchResult(path or None, cost if path else None, expanded, elapsed, stats)
+
+    def search_steps(self, start, end, batch=64):
+        # generator of (opened, closed) cell batches that returns the SearchResult;
+        # engines without a stepping search finish in a single step
+        yield [], []
+        return self.search(start, end)
+
+
+def path_cost(path):
+    return sum(math.hypot(a[0] - b[0], a[1] - b[1]) for a, b in zip(path, path[1:]))
+
+
+@register_backend('a_star')
+class AStarBackend(Backend):
+    def __init__(self, matrix, heuristic='octile', weight=1.0):
+        super().__init__(matrix)
+        self.solver = Solver(matrix, heuristic=heuristic, weight=weight)
+
+    def find(self, start, end):
+        path = self.solver.create_path(start, end)
+        return path, self.solver.cost, self.solver.expanded
+
+    def find_stats(self, expanded, elapsed):
+        return self.solver.stats
+
+    def search_steps(self, start, end, batch=64):
+        # elapsed includes the time the caller spends between batches, the
+        # stats' phase times do not
+        start = tuple(start)
+        end = tuple(end)
+        if not (self.free(start) and self.free(end)):
+            return self.unreachable()
+        solver = self.solver
+        started = time.perf_counter()
+        yield from solver.search(start, end, batch)
+        elapsed = time.perf_counter() - started
+        return self.result(solver.path, solver.cost, solver.expanded, elapsed)
+
+
+@register_backend('weighted_a_star')
+class WeightedAStarBackend(AStarBackend):
+    # bounded-suboptimal mode for latency-sensitive queries: cost <= weight * optimum
+    def __init__(self, matrix, heuristic='octile', weight=1.5):
+        super().__init__(matrix, heuristic, weight)
+
+
+@register_backend('bidirectional')
+class BidirectionalBackend(AStarBackend):
+    # no weight option: the stopping rule needs consistent potentials
+    def __init__(self, matrix, heuristic='octile'):
+        Backend.__init__(self, matrix)
+        self.solver = BidirectionalSolver(matrix, heuristic=heuristic)
+
+    search_steps = Backend.search_steps
+    find_stats = Backend.find_stats
+
+
+@register_backend('library')
+class LibraryBackend(Backend):
+    requires = 'pathfinding'
+
+    def __init__(self, matrix):
+        from pathfinding.core.diagonal_movement import DiagonalMovement
+        from pathfinding.core.grid import Grid
+        from pathfinding.finder.a_star import AStarFinder
+
+        super().__init__(matrix)
+        self.grid = Grid(matrix=[[int(value == 1) for value in row] for row in matrix])
+        self.finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
+
+    def find(self, start, end):
+        # the library indexes nodes as (x, y), i.e. (col, row)
+        self.grid.cleanup()
+        start_node = self.grid.node(start[1], start[0])
+        end_node = self.grid.node(end[1], end[0])
+        nodes, runs = self.finder.find_path(start_node, end_node, self.grid)
+
+        path = [(node.y, node.x) for node in nodes]
+        return path, path_cost(path), runs
+
+
+@register_backend('jps')
+class JumpPointBackend(Backend):
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.solver = JumpPointSolver(matrix)
+
+    def find(self, start, end):
+        path = self.solver.create_path(start, end)
+        return path, self.solver.cost, self.solver.expanded
+
+
+@register_backend('lpa')
+class IncrementalBackend(Backend):
+    incremental = True
+
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.planner = IncrementalPlanner(matrix)
+
+    def update_cells(self, cells, matrix):
+        self.set_matrix(matrix)
+        self.planner.update_cells(cells, matrix)
+
+    def find(self, start, end):
+        path = self.planner.create_path(start, end)
+        return path, self.planner.cost, self.planner.expanded
+
+
+@register_backend('distance_field')
+class DistanceFieldBackend(Backend):
+    # one flood per end cell, after which every start only follows the flow
+    def __init__(self, matrix, maxsize=16):
+        super().__init__(matrix)
+        self.fields = FieldCache(maxsize)
+
+    def find(self, start, end):
+        misses = self.fields.misses
+        field = self.fields.get(None, self.matrix, [end])
+        # a fresh field settled every reachable cell, a cached one nothing
+        expanded = int(np.isfinite(field.distances).sum()) if self.fields.misses != misses else 0
+        return field.path_from(start), field.distance(start), expanded
+
+
+@register_backend('hpa')
+class HierarchicalBackend(Backend):
+    # near-optimal; wall edits rebuild only the clusters around the edited cells
+    incremental = True
+
+    def __init__(self, matrix, cluster_size=16):
+        super().__init__(matrix)
+        self.planner = HierarchicalPlanner(matrix, cluster_size)
+
+    def update_cells(self, cells, matrix):
+        self.set_matrix(matrix)
+        self.planner.update_cells(cells, matrix)
+
+    def find(self, start, end):
+        path = self.planner.create_path(start, end)
+        return path, self.planner.cost, self.planner.expanded
+
+
+@register_backend('terrain')
+class TerrainBackend(Backend):
+    # A* over terrain weights with a bucket queue; costs are in the integer
+    # steps of weighted.py, so 1.4 rather than sqrt(2) per diagonal
+    weighted = True
+
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.solver = WeightedSolver(matrix)
+
+    def find(self, start, end):
+        path = self.solver.create_path(start, end)
+        return path, self.solver.cost, self.solver.expanded
+
+
+@register_backend('terrain_heap')
+class HeapTerrainBackend(TerrainBackend):
+    # the same search on a binary heap
+    def __init__(self, matrix):
+        Backend.__init__(self, matrix)
+        self.solver = HeapWeightedSolver(matrix)
+
+
+@register_backend('theta_star')
+class ThetaStarBackend(Backend):
+    # any-angle paths: straight lines between waypoints, euclidean costs
+    any_angle = True
+
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.solver = ThetaStarSolver(matrix)
+
+    def find(self, start, end):
+        path = self.solver.create_path(start, end)
+        return path, self.solver.cost, self.solver.expanded
+
+    def find_stats(self, expanded, elapsed):
+        return self.solver.stats
@@ -0,0 +1,95 @@
+import collections
+import queue
+import threading
+
+
+class Job:
+    # one submitted call; its function reports progress with put() and expanded
+    # and should return early once cancelled is set. With a limit, put() waits
+    # while that many batches are still untaken, so a slow reader holds the
+    # job back instead of letting batches pile up.
+    def __init__(self, function, args, limit=None):
+        self.function = function
+        self.args = args
+        self.batches = collections.deque()
+        self.limit = limit
+        self.keep = True
+        self.space = threading.Condition()
+        self.expanded = 0
+        self.result = None
+        self.error = None
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+
+    def put(self, batch):
+        with self.space:
+            while (self.limit is not None and len(self.batches) >= self.limit
+                   and not self.cancelled.is_set()):
+                self.space.wait()
+            if self.keep:
+                self.batches.append(batch)
+
+    def take(self):
+        with self.space:
+            batch = self.batches.popleft()
+            self.space.notify()
+        return batch
+
+    def release(self, keep=True):
+        # lift the limit; without keep, pending and later batches are dropped,
+        # for callers that only want the result
+        with self.space:
+            self.limit = None
+            self.keep = keep
+            if not keep:
+                self.batches.clear()
+            self.space.notify()
+
+    def cancel(self):
+        self.cancelled.set()
+        with self.space:
+            self.space.notify()
+
+    def done(self):
+        return self.finished.is_set()
+
+    def wait(self, timeout=None):
+        return self.finished.wait(timeout)
+
+
+class Worker:
+    # a single thread that runs jobs one after the other, so whatever state the
+    # jobs share is only ever touched by this thread. Submitting a job cancels
+    # the one before it; cancelled jobs still run, and it is up to them to skip
+    # the expensive part.
+    def __init__(self, name='worker'):
+        self.jobs = queue.Queue()
+        self.current = None
+        self.thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, function, *args, limit=None):
+        job = Job(function, args, limit)
+        if self.current is not None:
+            self.current.cancel()
+        self.current = job
+        self.jobs.put(job)
+        return job
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            try:
+                job.result = job.function(job, *job.args)
+            except Exception as error:
+                job.error = error
+            finally:
+                job.finished.set()
+
+    def stop(self):
+        if self.current is not None:
+            self.current.cancel()
+        self.jobs.put(None)
+        self.thread.join()
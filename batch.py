@@ -0,0 +1,45 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backends import backend_matrix, get_backend
+
+# per-process state, set up once by init_worker
+_worker = {}
+
+
+def init_worker(name, shape, backend):
+    # attach to the parent's copy of the matrix instead of receiving it with every task
+    memory = shared_memory.SharedMemory(name=name)
+    matrix = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+    _worker['memory'] = memory
+    _worker['backend'] = get_backend(backend, matrix)
+
+
+def solve_query(task):
+    index, (start, end) = task
+    return index, _worker['backend'].search(start, end)
+
+
+# yields (index, SearchResult) in completion order, index being the query's position;
+# matrix may hold terrain weights, which only weighted backends get to see
+def solve_batch(matrix, queries, processes=None, chunksize=16, backend='a_star'):
+    cells = np.asarray(backend_matrix(backend, matrix, weighted=True), dtype=np.uint8)
+    queries = list(queries)
+
+    if processes == 1:
+        engine = get_backend(backend, cells)
+        for index, (start, end) in enumerate(queries):
+            yield index, engine.search(start, end)
+        return
+
+    memory = shared_memory.SharedMemory(create=True, size=max(cells.nbytes, 1))
+    try:
+        np.ndarray(cells.shape, dtype=np.uint8, buffer=memory.buf)[:] = cells
+        with multiprocessing.Pool(processes, initializer=init_worker,
+                                  initargs=(memory.name, cells.shape, backend)) as pool:
+            yield from pool.imap_unordered(solve_query, enumerate(queries), chunksize)
+    finally:
+        memory.close()
+        memory.unlink()
@@ -0,0 +1,40 @@
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from backends import available_backends
+from batch import solve_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure batch.solve_batch throughput for growing process counts.')
+    parser.add_argument('--size', type=int, default=300)
+    parser.add_argument('--density', type=float, default=0.2)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument('--backend', default='a_star', choices=available_backends())
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    matrix = (rng.random((args.size, args.size)) >= args.density).astype(int)
+    free = [tuple(cell) for cell in np.argwhere(matrix == 1).tolist()]
+    pick = random.Random(args.seed)
+    queries = [(pick.choice(free), pick.choice(free)) for _ in range(args.queries)]
+
+    print(f'{"processes":>9} {"time [s]":>9} {"queries/s":>10}')
+    for processes in args.processes:
+        started = time.perf_counter()
+        for _ in solve_batch(matrix, queries, processes=processes, backend=args.backend):
+            pass
+        elapsed = time.perf_counter() - started
+        print(f'{processes:>9} {elapsed:>9.2f} {len(queries) / elapsed:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
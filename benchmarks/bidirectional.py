@@ -0,0 +1,45 @@
+import argparse
+import time
+
+from benchmarks.maps import GENERATORS, generate
+from bidirectional import BidirectionalSolver
+from solver import Solver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Expanded nodes of bidirectional and single-direction search '
+                    'on long corner-to-corner queries.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[256, 512])
+    parser.add_argument('--maps', nargs='+', default=['open', 'random10', 'random30', 'rooms', 'maze'],
+                        choices=sorted(GENERATORS))
+    parser.add_argument('--heuristics', nargs='+', default=['zero', 'octile'])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"map":>9} {"size":>5} {"heuristic":>9} {"one-way":>9} {"two-way":>9} '
+          f'{"ratio":>6} {"one [s]":>8} {"two [s]":>8}')
+    for size in args.sizes:
+        for map_name in args.maps:
+            matrix = generate(map_name, size, args.seed)
+            start, end = (0, 0), (size - 1, size - 1)
+            matrix[start] = matrix[end] = 1
+
+            for heuristic in args.heuristics:
+                results = []
+                for solver_class in (Solver, BidirectionalSolver):
+                    solver = solver_class(matrix, heuristic=heuristic)
+                    started = time.perf_counter()
+                    solver.create_path(start, end)
+                    results.append((solver, time.perf_counter() - started))
+                (single, single_time), (double, double_time) = results
+
+                if single.cost is not None:
+                    assert abs(single.cost - double.cost) < 1e-6, (single.cost, double.cost)
+                ratio = single.expanded / max(double.expanded, 1)
+                print(f'{map_name:>9} {size:>5} {heuristic:>9} {single.expanded:>9} '
+                      f'{double.expanded:>9} {ratio:>5.2f}x {single_time:>8.3f} {double_time:>8.3f}')
+
+
+if __name__ == '__main__':
+    main()
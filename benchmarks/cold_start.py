@@ -0,0 +1,67 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from map_io import save_map
+
+# each is run in a fresh interpreter, so imports are paid every time
+IMPORTS = [
+    ('python', 'pass'),
+    ('numpy', 'import numpy'),
+    ('backends', 'import backends'),
+    ('solve', 'import solve'),
+    ('a_star', 'import a_star'),
+    ('game', 'import game'),
+    ('pygame', 'import pygame'),
+]
+
+
+def best_time(command, runs, stdin=None):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, input=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=True, env={**os.environ, 'PYGAME_HIDE_SUPPORT_PROMPT': '1'})
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Cold-start time of fresh interpreters importing the modules and running '
+                    'one query through python -m solve.')
+    parser.add_argument('--runs', type=int, default=5, help='runs per command, the best is kept')
+    parser.add_argument('--size', type=int, default=256)
+    args = parser.parse_args()
+
+    print(f'{"command":>22} {"best [ms]":>10}')
+    for name, code in IMPORTS:
+        label = 'import ' + name if code != 'pass' else name
+        try:
+            elapsed = best_time([sys.executable, '-c', code], args.runs)
+        except subprocess.CalledProcessError:
+            # pygame is optional, and headless boxes are what this measures
+            print(f'{label:>22} {"not installed":>10}')
+            continue
+        print(f'{label:>22} {elapsed * 1000:>10.1f}')
+
+    # importing the GUI modules must not load pygame
+    check = 'import sys, a_star, game, solve; print(int("pygame" in sys.modules))'
+    loaded = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True, check=True)
+    print(f'{"pygame loaded":>22} {"yes" if loaded.stdout.strip() == "1" else "no":>10}')
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'map.gmap')
+        save_map(path, np.ones((args.size, args.size), dtype=np.uint8))
+        query = f'0 0 {args.size - 1} {args.size - 1}\n'.encode()
+        elapsed = best_time([sys.executable, '-m', 'solve', path], args.runs, query)
+        print(f'{"solve one query":>22} {elapsed * 1000:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.maps import GENERATORS, generate
+from components import ComponentIndex
+from solver import Solver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Unreachable queries answered by A* and by the component index, '
+                    'plus labelling and single-cell update times.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[256, 1000])
+    parser.add_argument('--maps', nargs='+', default=['open', 'random30', 'rooms', 'maze'],
+                        choices=sorted(GENERATORS))
+    parser.add_argument('--edits', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"map":>9} {"size":>5} {"label [ms]":>10} {"a* [ms]":>9} {"index [us]":>10} '
+          f'{"edit [ms]":>9} {"max [ms]":>9}')
+    for size in args.sizes:
+        for map_name in args.maps:
+            matrix = generate(map_name, size, args.seed)
+            # wall the end into a small pocket in the far corner
+            matrix[size - 3, size - 3:] = 0
+            matrix[size - 3:, size - 3] = 0
+            start, end = (0, 0), (size - 1, size - 1)
+            matrix[start] = matrix[end] = 1
+
+            started = time.perf_counter()
+            index = ComponentIndex(matrix)
+            labelling = time.perf_counter() - started
+
+            started = time.perf_counter()
+            assert Solver(matrix).create_path(start, end) is None
+            a_star = time.perf_counter() - started
+
+            started = time.perf_counter()
+            assert not index.connected(start, end)
+            lookup = time.perf_counter() - started
+
+            pick = random.Random(args.seed)
+            edits = []
+            for _ in range(args.edits):
+                cell = (pick.randrange(size - 3), pick.randrange(size - 3))
+                matrix[cell] = 1 - matrix[cell]
+                started = time.perf_counter()
+                index.update_cells([cell], matrix)
+                edits.append(time.perf_counter() - started)
+
+            print(f'{map_name:>9} {size:>5} {labelling * 1000:>10.2f} {a_star * 1000:>9.2f} '
+                  f'{lookup * 1e6:>10.2f} {statistics.median(edits) * 1000:>9.3f} '
+                  f'{max(edits) * 1000:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
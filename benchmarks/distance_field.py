@@ -0,0 +1,59 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.maps import GENERATORS, generate
+from distance_field import DistanceField
+from solver import Solver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Many agents heading for one target: one A* per agent against '
+                    'one distance field followed by every agent.')
+    parser.add_argument('--size', type=int, default=500)
+    parser.add_argument('--maps', nargs='+', default=['open', 'random30', 'rooms', 'maze'],
+                        choices=sorted(GENERATORS))
+    parser.add_argument('--agents', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"map":>9} {"agents":>6} {"a* [s]":>8} {"field [s]":>9} {"follow [s]":>10} {"speedup":>8}')
+    for map_name in args.maps:
+        matrix = generate(map_name, args.size, args.seed)
+        target = (args.size // 2, args.size // 2)
+        matrix[target] = 1
+        free = np.argwhere(matrix == 1)
+        rng = np.random.default_rng(args.seed)
+
+        started = time.perf_counter()
+        field = DistanceField(matrix, [target])
+        build = time.perf_counter() - started
+
+        for agents in args.agents:
+            starts = [tuple(cell) for cell in free[rng.choice(len(free), agents)]]
+
+            started = time.perf_counter()
+            solver = Solver(matrix)
+            costs = []
+            for start in starts:
+                solver.create_path(start, target)
+                costs.append(solver.cost)
+            a_star = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for start, cost in zip(starts, costs):
+                path = field.path_from(start)
+                assert (path is None) == (cost is None)
+            follow = time.perf_counter() - started
+
+            for start, cost in zip(starts, costs):
+                if cost is not None:
+                    assert abs(field.distance(start) - cost) < 1e-6, (start, field.distance(start), cost)
+            print(f'{map_name:>9} {agents:>6} {a_star:>8.3f} {build:>9.3f} {follow:>10.4f} '
+                  f'{a_star / (build + follow):>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
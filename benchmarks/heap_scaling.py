@@ -0,0 +1,33 @@
+import argparse
+import time
+
+from benchmarks.maps import random_map
+from solver import Solver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Time the heap solver corner to corner on growing random grids.')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[40, 100, 250, 500, 1000])
+    parser.add_argument('--density', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"size":>6} {"cells":>9} {"time [s]":>9} {"us/cell":>8} {"cost":>10}')
+    for size in args.sizes:
+        matrix = random_map(size, args.density, args.seed)
+        matrix[0, 0] = matrix[-1, -1] = 1
+        pathfinder = Solver(matrix)
+
+        started = time.perf_counter()
+        path = pathfinder.create_path((0, 0), (size - 1, size - 1))
+        elapsed = time.perf_counter() - started
+
+        cost = f'{pathfinder.cost:.2f}' if path else 'no path'
+        print(f'{size:>6} {size * size:>9} {elapsed:>9.3f} '
+              f'{elapsed / (size * size) * 1e6:>8.2f} {cost:>10}')
+
+
+if __name__ == '__main__':
+    main()
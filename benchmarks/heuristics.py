@@ -0,0 +1,53 @@
+import argparse
+import time
+
+from benchmarks.maps import GENERATORS, generate, make_queries
+from heuristics import HEURISTICS
+from solver import Solver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare Solver heuristics and weights on generated maps.')
+    parser.add_argument('--size', type=int, default=256)
+    parser.add_argument('--maps', nargs='+', default=['open', 'random10', 'rooms'],
+                        choices=sorted(GENERATORS))
+    parser.add_argument('--heuristics', nargs='+', default=['euclidean', 'octile', 'zero'],
+                        choices=sorted(HEURISTICS))
+    parser.add_argument('--weights', type=float, nargs='+', default=[1.0, 1.5, 3.0])
+    parser.add_argument('--queries', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"map":>9} {"heuristic":>10} {"weight":>6} {"expanded":>9} {"time [s]":>9} '
+          f'{"cost ratio":>10}')
+    for map_name in args.maps:
+        matrix = generate(map_name, args.size, args.seed)
+        queries = make_queries(matrix, args.queries, args.seed)
+
+        reference = Solver(matrix, heuristic='octile')
+        optimal = []
+        for start, end in queries:
+            reference.create_path(start, end)
+            optimal.append(reference.cost)
+
+        for name in args.heuristics:
+            for weight in args.weights if name != 'zero' else [1.0]:
+                solver = Solver(matrix, heuristic=name, weight=weight)
+                expanded = 0
+                elapsed = 0.0
+                ratios = []
+                for (start, end), best in zip(queries, optimal):
+                    started = time.perf_counter()
+                    solver.create_path(start, end)
+                    elapsed += time.perf_counter() - started
+                    expanded += solver.expanded
+                    if best:
+                        ratios.append(solver.cost / best)
+                worst = max(ratios) if ratios else 1.0
+                print(f'{map_name:>9} {name:>10} {weight:>6.1f} {expanded:>9} {elapsed:>9.3f} '
+                      f'{worst:>10.4f}')
+
+
+if __name__ == '__main__':
+    main()
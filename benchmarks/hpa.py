@@ -0,0 +1,65 @@
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.maps import GENERATORS, generate, make_queries
+from hpa import HierarchicalPlanner
+from solver import Solver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='HPA* build, query and wall-edit update times against plain A*.')
+    parser.add_argument('--size', type=int, default=512)
+    parser.add_argument('--maps', nargs='+', default=['random10', 'random30', 'rooms', 'maze'],
+                        choices=sorted(GENERATORS))
+    parser.add_argument('--cluster-size', type=int, default=16)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--edits', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"map":>9} {"build [s]":>9} {"hpa [ms]":>9} {"a* [ms]":>9} {"speedup":>8} '
+          f'{"cost +%":>8} {"edit [ms]":>9}')
+    for map_name in args.maps:
+        matrix = generate(map_name, args.size, args.seed)
+        started = time.perf_counter()
+        planner = HierarchicalPlanner(matrix, args.cluster_size)
+        build = time.perf_counter() - started
+        solver = Solver(matrix)
+
+        hpa_times = []
+        a_star_times = []
+        overheads = []
+        for start, end in make_queries(matrix, args.queries, args.seed):
+            started = time.perf_counter()
+            planner.create_path(start, end)
+            hpa_times.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            solver.create_path(start, end)
+            a_star_times.append(time.perf_counter() - started)
+
+            assert (planner.cost is None) == (solver.cost is None), (start, end)
+            if solver.cost:
+                overheads.append(planner.cost / solver.cost - 1)
+
+        # single-cell wall toggles, as drawn in the game
+        pick = random.Random(args.seed)
+        edits = []
+        for _ in range(args.edits):
+            cell = (pick.randrange(args.size), pick.randrange(args.size))
+            matrix[cell] = 1 - matrix[cell]
+            started = time.perf_counter()
+            planner.update_cells([cell], matrix)
+            edits.append(time.perf_counter() - started)
+
+        hpa_time = statistics.median(hpa_times)
+        a_star_time = statistics.median(a_star_times)
+        overhead = statistics.mean(overheads) * 100 if overheads else 0.0
+        print(f'{map_name:>9} {build:>9.2f} {hpa_time * 1000:>9.2f} {a_star_time * 1000:>9.2f} '
+              f'{a_star_time / hpa_time:>7.1f}x {overhead:>8.2f} {statistics.median(edits) * 1000:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import argparse
+import time
+
+from benchmarks.maps import random_map
+from jps import JumpPointSolver
+from solver import Solver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare node expansions of Jump Point Search and plain A*.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[40, 200, 500])
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.0, 0.1, 0.3])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"size":>5} {"walls":>5} {"A* exp":>9} {"JPS exp":>8} {"ratio":>7} '
+          f'{"A* [s]":>8} {"JPS [s]":>8}')
+    for size in args.sizes:
+        for density in args.densities:
+            matrix = random_map(size, density, args.seed)
+            # off the main diagonal, so that ties on f do not make plain A* look ideal
+            start, end = (0, 0), (size // 3, size - 1)
+            matrix[start] = matrix[end] = 1
+
+            results = []
+            for solver in (Solver(matrix), JumpPointSolver(matrix)):
+                started = time.perf_counter()
+                solver.create_path(start, end)
+                results.append((solver, time.perf_counter() - started))
+            (a_star, a_star_time), (jps, jps_time) = results
+
+            if a_star.cost is not None:
+                assert abs(a_star.cost - jps.cost) < 1e-9, (a_star.cost, jps.cost)
+            ratio = a_star.expanded / max(jps.expanded, 1)
+            print(f'{size:>5} {density:>5.2f} {a_star.expanded:>9} {jps.expanded:>8} '
+                  f'{ratio:>6.1f}x {a_star_time:>8.3f} {jps_time:>8.3f}')
+
+
+if __name__ == '__main__':
+    main()
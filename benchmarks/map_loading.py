@@ -0,0 +1,49 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.maps import generate
+from map_io import open_map, read_movingai, save_map, write_movingai
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='File size and open time of the map formats.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 4000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"size":>5} {"format":>8} {"file [MiB]":>10} {"save [s]":>8} {"open [ms]":>9} '
+          f'{"first row [ms]":>14} {"full read [s]":>13}')
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            matrix = generate('random30', size, args.seed)
+            formats = (
+                ('uint8', 'grid.gmap', lambda path: save_map(path, matrix), open_map),
+                ('bits', 'bits.gmap', lambda path: save_map(path, matrix, packed=True), open_map),
+                ('movingai', 'grid.map', lambda path: write_movingai(path, matrix), read_movingai),
+            )
+            for name, filename, save, load in formats:
+                path = os.path.join(directory, filename)
+                _, saving = timed(save, path)
+                loaded, opening = timed(load, path)
+                _, first_row = timed(lambda: np.asarray(loaded[0]).sum())
+                # counting free cells touches every page of a memory-mapped file
+                _, reading = timed(lambda: np.count_nonzero(np.asarray(loaded)))
+                assert np.array_equal(np.asarray(loaded), matrix)
+                print(f'{size:>5} {name:>8} {os.path.getsize(path) / 2 ** 20:>10.2f} {saving:>8.3f} '
+                      f'{opening * 1000:>9.2f} {first_row * 1000:>14.3f} {reading:>13.3f}')
+                del loaded
+
+
+if __name__ == '__main__':
+    main()
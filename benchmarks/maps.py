@@ -0,0 +1,103 @@
+import numpy as np
+
+# every generator returns a (size, size) int matrix with 1 for free cells and 0
+# for walls, and is fully determined by its arguments; terrain_map returns
+# weights instead
+
+
+def open_map(size, seed=0):
+    return np.ones((size, size), dtype=int)
+
+
+def random_map(size, density=0.2, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.random((size, size)) >= density).astype(int)
+
+
+def maze_map(size, seed=0):
+    # binary tree maze: every room carves a passage either down or right
+    rng = np.random.default_rng(seed)
+    matrix = np.zeros((size, size), dtype=int)
+    rooms = (size + 1) // 2
+    matrix[0::2, 0::2] = 1
+
+    down = rng.random((rooms, rooms)) < 0.5
+    # the last row can only go right and the last column only down
+    down[-1, :] = False
+    down[:, -1] = True
+    down[-1, -1] = False
+
+    rows, cols = np.nonzero(down)
+    rows, cols = 2 * rows + 1, 2 * cols
+    keep = rows < size
+    matrix[rows[keep], cols[keep]] = 1
+
+    rows, cols = np.nonzero(~down)
+    rows, cols = 2 * rows, 2 * cols + 1
+    keep = cols < size
+    matrix[rows[keep], cols[keep]] = 1
+    return matrix
+
+
+def rooms_map(size, seed=0, room=16, door=2):
+    # square rooms separated by one-cell walls, each wall with one door to the next room
+    rng = np.random.default_rng(seed)
+    matrix = np.ones((size, size), dtype=int)
+    matrix[room::room + 1, :] = 0
+    matrix[:, room::room + 1] = 0
+
+    rooms = (size + room) // (room + 1)
+    offsets = rng.integers(0, max(room - door, 1), size=(2, rooms, rooms))
+    for i in range(rooms):
+        for j in range(rooms):
+            top = i * (room + 1)
+            left = j * (room + 1)
+            # door through the wall below the room and through the wall to its right
+            wall_row = top + room
+            if wall_row < size:
+                start = left + offsets[0, i, j]
+                matrix[wall_row, start:min(start + door, left + room, size)] = 1
+            wall_col = left + room
+            if wall_col < size:
+                start = top + offsets[1, i, j]
+                matrix[start:min(start + door, top + room, size), wall_col] = 1
+    return matrix
+
+
+GENERATORS = {
+    'open': open_map,
+    'random10': lambda size, seed=0: random_map(size, 0.1, seed),
+    'random30': lambda size, seed=0: random_map(size, 0.3, seed),
+    'maze': maze_map,
+    'rooms': rooms_map,
+}
+
+
+def generate(name, size, seed=0):
+    return GENERATORS[name](size, seed=seed)
+
+
+def terrain_map(size, seed=0, density=0.1, max_weight=9):
+    # terrain weights for the weighted solvers: smooth patches of weight 1 to
+    # max_weight, 0 for walls
+    rng = np.random.default_rng(seed)
+    coarse = rng.random((size // 8 + 2, size // 8 + 2))
+    # bilinear upsampling of a coarse noise grid gives patches about 8 cells wide
+    position = np.arange(size) / 8
+    low = position.astype(int)
+    frac = position - low
+    rows = coarse[low] * (1 - frac)[:, None] + coarse[low + 1] * frac[:, None]
+    noise = rows[:, low] * (1 - frac) + rows[:, low + 1] * frac
+    matrix = 1 + (noise ** 2 * max_weight).astype(int).clip(0, max_weight - 1)
+    matrix[rng.random((size, size)) < density] = 0
+    return matrix
+
+
+def make_queries(matrix, count, seed=0):
+    # pairs of free cells; some may be disconnected, which exercises the no-path case
+    rng = np.random.default_rng(seed)
+    free = np.argwhere(np.asarray(matrix) == 1)
+    if len(free) == 0:
+        return []
+    picks = rng.integers(0, len(free), size=(count, 2))
+    return [(tuple(free[a].tolist()), tuple(free[b].tolist())) for a, b in picks]
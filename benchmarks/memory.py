@@ -0,0 +1,41 @@
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.maps import random_map
+from solver import Solver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Peak memory of one exhaustive Solver search, per million cells. '
+                    'tracemalloc makes the search much slower than usual.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500])
+    parser.add_argument('--density', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"size":>6} {"cells":>9} {"peak [MiB]":>11} {"MiB/Mcell":>10} {"time [s]":>9}')
+    for size in args.sizes:
+        matrix = random_map(size, args.density, args.seed)
+        # wall in the end so that the search has to visit every reachable cell
+        end = (size - 2, size - 2)
+        matrix[size - 3:size, size - 3:size] = 0
+        matrix[end] = 1
+        matrix[0, 0] = 1
+
+        solver = Solver(matrix)
+        tracemalloc.start()
+        started = time.perf_counter()
+        solver.create_path((0, 0), end)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        cells = size * size
+        print(f'{size:>6} {cells:>9} {peak / 2 ** 20:>11.1f} '
+              f'{peak / 2 ** 20 / (cells / 1e6):>10.1f} {elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
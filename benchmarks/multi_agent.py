@@ -0,0 +1,67 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.maps import GENERATORS, generate
+from multi_agent import MultiAgentPlanner
+from solver import Solver
+
+
+def make_agents(free, count, destinations, rng):
+    starts = free[rng.integers(0, len(free), size=count)]
+    ends = destinations[rng.integers(0, len(destinations), size=count)]
+    return [(tuple(start), tuple(end)) for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Per-tick planning time for many agents: one A* per agent against '
+                    'the multi-agent planner.')
+    parser.add_argument('--size', type=int, default=256)
+    parser.add_argument('--map', default='random10', choices=sorted(GENERATORS))
+    parser.add_argument('--agents', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--destinations', type=int, default=8)
+    parser.add_argument('--cooperative-max', type=int, default=100,
+                        help='largest agent count also planned cooperatively')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    matrix = generate(args.map, args.size, args.seed)
+    rng = np.random.default_rng(args.seed)
+    free = np.argwhere(matrix == 1)
+    destinations = free[rng.choice(len(free), size=args.destinations, replace=False)]
+
+    # the first tick floods the destinations' fields, later ticks with new
+    # starts reuse them
+    print(f'{"agents":>6} {"A* [s]":>8} {"first [s]":>10} {"next [s]":>9} {"speedup":>8} {"coop [s]":>9}')
+    for count in args.agents:
+        first_tick = make_agents(free, count, destinations, rng)
+        next_tick = make_agents(free, count, destinations, rng)
+
+        solver = Solver(matrix)
+        started = time.perf_counter()
+        expected = [solver.create_path(start, end) for start, end in next_tick]
+        a_star_time = time.perf_counter() - started
+
+        planner = MultiAgentPlanner(matrix)
+        started = time.perf_counter()
+        planner.plan(first_tick)
+        first_time = time.perf_counter() - started
+        started = time.perf_counter()
+        paths = planner.plan(next_tick)
+        next_time = time.perf_counter() - started
+        assert [path is None for path in paths] == [path is None for path in expected]
+
+        coop = '-'
+        if count <= args.cooperative_max:
+            planner = MultiAgentPlanner(matrix, cooperative=True)
+            started = time.perf_counter()
+            planner.plan(first_tick)
+            coop = f'{time.perf_counter() - started:.3f}'
+        print(f'{count:>6} {a_star_time:>8.3f} {first_time:>10.3f} {next_time:>9.3f} '
+              f'{a_star_time / next_time:>7.1f}x {coop:>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import argparse
+
+import numpy as np
+
+from backends import available_backends, backend_matrix, get_backend
+from benchmarks.maps import GENERATORS, generate
+from map_io import load_map, map_weighted
+from search_stats import profile_search
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run one query under cProfile and tracemalloc and write a report.')
+    parser.add_argument('--backend', default='a_star', choices=available_backends())
+    parser.add_argument('--map', help='map file; a generated map otherwise')
+    parser.add_argument('--generator', default='random10', choices=sorted(GENERATORS))
+    parser.add_argument('--size', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--start', type=int, nargs=2, metavar=('ROW', 'COL'))
+    parser.add_argument('--end', type=int, nargs=2, metavar=('ROW', 'COL'))
+    parser.add_argument('--output', default='profile.txt')
+    args = parser.parse_args()
+
+    if args.map:
+        matrix = np.asarray(backend_matrix(args.backend, load_map(args.map), map_weighted(args.map)))
+    else:
+        matrix = generate(args.generator, args.size, args.seed)
+    rows, cols = matrix.shape
+    # corner to corner unless told otherwise
+    start = tuple(args.start) if args.start else (0, 0)
+    end = tuple(args.end) if args.end else (rows - 1, cols - 1)
+    if not args.map:
+        matrix[start] = matrix[end] = 1
+
+    backend = get_backend(args.backend, matrix)
+    result = profile_search(backend, start, end, args.output)
+    print(result)
+    print(result.stats)
+    print(f'report written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
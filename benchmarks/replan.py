@@ -0,0 +1,72 @@
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from lpa_star import IncrementalPlanner
+from solver import Solver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare LPA* replanning with a full A* rerun after small wall edits.')
+    parser.add_argument('--size', type=int, default=300)
+    parser.add_argument('--density', type=float, default=0.2)
+    parser.add_argument('--edits', type=int, default=20,
+                        help='number of edit rounds')
+    parser.add_argument('--cells', type=int, default=3,
+                        help='cells toggled per edit round')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    pick = random.Random(args.seed)
+    size = args.size
+    matrix = (rng.random((size, size)) >= args.density).astype(int)
+    start, end = (0, 0), (size - 1, size - 1)
+    matrix[start] = matrix[end] = 1
+
+    planner = IncrementalPlanner(matrix)
+    started = time.perf_counter()
+    planner.create_path(start, end)
+    print(f'initial LPA* solve: {time.perf_counter() - started:.3f} s, '
+          f'{planner.expanded} expansions')
+
+    replans = []
+    reruns = []
+    for _ in range(args.edits):
+        path = planner.create_path(start, end) or [start]
+        # edit around the current path so that the edits actually matter
+        cells = []
+        for _ in range(args.cells):
+            row, col = pick.choice(path)
+            cell = (min(max(row + pick.randint(-2, 2), 0), size - 1),
+                    min(max(col + pick.randint(-2, 2), 0), size - 1))
+            if cell not in (start, end):
+                matrix[cell] = 1 - matrix[cell]
+                cells.append(cell)
+
+        started = time.perf_counter()
+        planner.update_cells(cells, matrix)
+        planner.create_path(start, end)
+        replans.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        solver = Solver(matrix)
+        solver.create_path(start, end)
+        reruns.append(time.perf_counter() - started)
+
+        if solver.cost is None or planner.cost is None:
+            assert solver.cost is planner.cost, (solver.cost, planner.cost)
+        else:
+            assert abs(solver.cost - planner.cost) < 1e-9, (solver.cost, planner.cost)
+
+    print(f'{"":>14} {"median [ms]":>12} {"max [ms]":>10}')
+    for name, times in (('LPA* replan', replans), ('A* rerun', reruns)):
+        print(f'{name:>14} {statistics.median(times) * 1000:>12.2f} {max(times) * 1000:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import json
+import time
+
+from backends import get_backend, path_cost
+from benchmarks.maps import GENERATORS, generate, make_queries
+
+
+def payload(path):
+    # bytes to send the path as JSON
+    return len(json.dumps(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Waypoints, cost and payload of A* paths, smoothed A* paths and Theta* paths.')
+    parser.add_argument('--size', type=int, default=256)
+    parser.add_argument('--maps', nargs='+', default=sorted(GENERATORS), choices=sorted(GENERATORS))
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"map":>9} {"mode":>9} {"waypoints":>9} {"kept":>6} {"cost":>8} {"bytes":>7} {"time [s]":>9}')
+    for map_name in args.maps:
+        matrix = generate(map_name, args.size, args.seed)
+        queries = make_queries(matrix, args.queries, args.seed)
+        backends = (('a_star', get_backend('a_star', matrix)),
+                    ('smoothed', get_backend('a_star', matrix, smooth=True)),
+                    ('theta', get_backend('theta_star', matrix)))
+
+        cells = None
+        for mode, backend in backends:
+            waypoints = cost = size = 0
+            started = time.perf_counter()
+            results = [backend.search(start, end) for start, end in queries]
+            elapsed = time.perf_counter() - started
+            for result in results:
+                if result.found:
+                    waypoints += len(result.path)
+                    cost += path_cost(result.path)
+                    size += payload(result.path)
+            if cells is None:
+                cells = waypoints
+            print(f'{map_name:>9} {mode:>9} {waypoints:>9} {waypoints / max(cells, 1):>6.1%} '
+                  f'{cost:>8.1f} {size:>7} {elapsed:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from backends import BACKENDS, available_backends, get_backend, installed_backends
+from benchmarks.maps import GENERATORS, generate, make_queries
+
+# backends that build per-cell Python objects get too slow and big past this many cells
+MAX_CELLS = {'library': 512 * 512}
+
+
+def comparable(name):
+    return not BACKENDS[name].weighted and not BACKENDS[name].any_angle
+
+
+def run_backend(name, matrix, queries):
+    started = time.perf_counter()
+    backend = get_backend(name, matrix)
+    build_time = time.perf_counter() - started
+    results = [backend.search(start, end) for start, end in queries]
+    return build_time, results
+
+
+def peak_memory(name, matrix, queries):
+    tracemalloc.start()
+    try:
+        backend = get_backend(name, matrix)
+        for start, end in queries:
+            backend.search(start, end)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(sizes, maps, backends, query_count, seed, measure_memory=True, log=print):
+    records = []
+    for size in sizes:
+        for map_name in maps:
+            matrix = generate(map_name, size, seed)
+            queries = make_queries(matrix, query_count, seed)
+
+            runs = {}
+            for name in backends:
+                if size * size > MAX_CELLS.get(name, float('inf')):
+                    log(f'skip {name:>8} on {map_name} {size}x{size}')
+                    continue
+                runs[name] = run_backend(name, matrix, queries)
+
+            # the reference cost of each query is the best cost any grid backend
+            # found; any-angle and terrain costs are not on the same scale
+            reference = []
+            for index in range(len(queries)):
+                costs = [results[index].cost for name, (_, results) in runs.items()
+                         if results[index].found and comparable(name)]
+                reference.append(min(costs) if costs else None)
+
+            for name, (build_time, results) in runs.items():
+                ratios = [result.cost / best if best else 1.0
+                          for result, best in zip(results, reference) if result.found]
+                missed = sum(1 for result, best in zip(results, reference)
+                             if best is not None and not result.found)
+                search_time = sum(result.elapsed for result in results)
+                record = {
+                    'map': map_name,
+                    'size': size,
+                    'backend': name,
+                    'queries': len(queries),
+                    'found': sum(1 for result in results if result.found),
+                    'missed': missed,
+                    'build_time': build_time,
+                    'search_time': search_time,
+                    'mean_query_time': search_time / max(len(results), 1),
+                    'expanded': sum(result.expanded for result in results),
+                    'cost_ratio_mean': float(np.mean(ratios)) if ratios else 1.0,
+                    'cost_ratio_max': max(ratios) if ratios else 1.0,
+                    'peak_memory': peak_memory(name, matrix, queries) if measure_memory else None,
+                }
+                records.append(record)
+                log(format_record(record))
+    return records
+
+
+def format_record(record):
+    memory = record['peak_memory']
+    memory = f'{memory / 2 ** 20:8.1f}' if memory is not None else f'{"-":>8}'
+    return (f'{record["map"]:>9} {record["size"]:>5} {record["backend"]:>8} '
+            f'{record["found"]:>4}/{record["queries"]:<4} {record["search_time"]:>8.3f}s '
+            f'{record["expanded"]:>10} {memory} MiB  x{record["cost_ratio_max"]:.4f}')
+
+
+def compare(records, baseline, threshold):
+    # a regression is a slower search beyond threshold or a worse path than before
+    previous = {(r['map'], r['size'], r['backend']): r for r in baseline['results']}
+    regressions = []
+    for record in records:
+        old = previous.get((record['map'], record['size'], record['backend']))
+        if old is None:
+            continue
+        ratio = record['search_time'] / max(old['search_time'], 1e-9)
+        # runs of a few milliseconds are too noisy to call a slowdown on the ratio alone
+        slower = ratio > threshold and record['search_time'] - old['search_time'] > 0.005
+        worse = record['cost_ratio_max'] > old['cost_ratio_max'] + 1e-9 or \
+            record['missed'] > old['missed']
+        flag = 'REGRESSION' if slower or worse else ''
+        print(f'{record["map"]:>9} {record["size"]:>5} {record["backend"]:>8} '
+              f'time x{ratio:5.2f} {flag}')
+        if flag:
+            regressions.append(record)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run every backend on reproducible maps and save the results as JSON.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[40, 256, 1024],
+                        help='map sizes, up to 4096')
+    parser.add_argument('--maps', nargs='+', default=sorted(GENERATORS), choices=sorted(GENERATORS))
+    # terrain backends count diagonals as 1.4 and any-angle ones leave the grid,
+    # so their costs are not comparable; backends missing their package are left out
+    parser.add_argument('--backends', nargs='+',
+                        default=[name for name in installed_backends() if comparable(name)],
+                        choices=available_backends())
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the separate tracemalloc pass')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--baseline', help='compare against a previous JSON result file')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown factor reported as a regression')
+    args = parser.parse_args()
+
+    records = run_suite(args.sizes, args.maps, args.backends, args.queries, args.seed,
+                        measure_memory=not args.no_memory)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.platform(),
+                'arguments': vars(args),
+                'results': records,
+            }, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if compare(records, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
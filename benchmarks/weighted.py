@@ -0,0 +1,53 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.maps import terrain_map
+from weighted import HeapWeightedSolver, WeightedSolver
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare the bucket-queue and the heap A* on terrain weights.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 300, 1000])
+    parser.add_argument('--max-weights', type=int, nargs='+', default=[1, 4, 9])
+    parser.add_argument('--queries', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"size":>5} {"max w":>5} {"heap exp":>9} {"buck exp":>9} {"heap [s]":>9} '
+          f'{"bucket [s]":>10} {"speedup":>8}')
+    for size in args.sizes:
+        for max_weight in args.max_weights:
+            matrix = terrain_map(size, args.seed, max_weight=max_weight)
+            rng = np.random.default_rng(args.seed)
+            # opposite corners, so every query crosses most of the map
+            queries = [((int(rng.integers(size // 10)), int(rng.integers(size // 10))),
+                        (size - 1 - int(rng.integers(size // 10)), size - 1 - int(rng.integers(size // 10))))
+                       for _ in range(args.queries)]
+            for start, end in queries:
+                matrix[start] = max(matrix[start], 1)
+                matrix[end] = max(matrix[end], 1)
+
+            results = []
+            for solver in (HeapWeightedSolver(matrix), WeightedSolver(matrix)):
+                costs = []
+                expanded = 0
+                started = time.perf_counter()
+                for start, end in queries:
+                    solver.create_path(start, end)
+                    costs.append(solver.cost)
+                    expanded += solver.expanded
+                results.append((costs, expanded, time.perf_counter() - started))
+            (heap_costs, heap_expanded, heap_time), (bucket_costs, bucket_expanded, bucket_time) = results
+
+            # same costs; ties can be broken differently, so expansions may differ
+            assert heap_costs == bucket_costs, (heap_costs, bucket_costs)
+            print(f'{size:>5} {max_weight:>5} {heap_expanded // len(queries):>9} '
+                  f'{bucket_expanded // len(queries):>9} {heap_time:>9.3f} {bucket_time:>10.3f} '
+                  f'{heap_time / bucket_time:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
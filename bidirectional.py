@@ -0,0 +1,111 @@
+import heapq
+import math
+from array import array
+
+from solver import CLOSED, FREE, Solver
+
+
+class BidirectionalSolver(Solver):
+    # A* from both ends at once with average potentials (Ikeda et al.): the forward
+    # search orders cells by g + (h_end - h_start) / 2 and the backward one by
+    # g + (h_start - h_end) / 2. Both then see the same consistent reduced edge
+    # costs, so the bidirectional Dijkstra stopping rule applies unchanged.
+    # With heuristic='zero' this is plain bidirectional Dijkstra. Equal keys pop
+    # the deeper cell first, as in Solver, so octile plateaus are not flooded.
+    def __init__(self, matrix, heuristic='octile'):
+        super().__init__(matrix, heuristic=heuristic)
+
+    def create_path(self, start, end):
+        self.start = start
+        self.end = end
+        self.cost = None
+        heuristic = self.heuristic
+        offsets = self.offsets
+        width = self.width
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        size = len(self.walkable)
+        start_index = self.index(start)
+        end_index = self.index(end)
+        if start_index == end_index:
+            self.expanded = 0
+            self.cost = 0.0
+            return [start]
+
+        # one set of arrays per direction: 0 searches from the start, 1 from the end
+        g_scores = (array('d', [math.inf]) * size, array('d', [math.inf]) * size)
+        parents = (array('i', [-1]) * size, array('i', [-1]) * size)
+        states = (bytearray(self.walkable), bytearray(self.walkable))
+        end_row, end_col = divmod(end_index, width)
+        start_row, start_col = divmod(start_index, width)
+        heaps = ([], [])
+        self.g_score, self.parent, self.state = g_scores[0], parents[0], states[0]
+        for side, origin in ((0, start_index), (1, end_index)):
+            g_scores[side][origin] = 0.0
+            heaps[side].append((0.0, 0.0, 0, origin))
+
+        # best complete path seen so far and the cell where its two halves meet
+        best = math.inf
+        meeting = -1
+        counter = 0
+        expanded = 0
+
+        while heaps[0] and heaps[1]:
+            # any path cheaper than best would have to join an open cell of each
+            # side, and in reduced costs it is at least the sum of the two top keys;
+            # the keys are rounded, so a sum a hair under best still means equal
+            if heaps[0][0][0] + heaps[1][0][0] >= best - 1e-9:
+                break
+
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            heap = heaps[side]
+            g_score = g_scores[side]
+            other_g = g_scores[1 - side]
+            parent = parents[side]
+            state = states[side]
+            sign = 0.5 if side == 0 else -0.5
+
+            current = heappop(heap)[3]
+            if state[current] == CLOSED:
+                continue
+            state[current] = CLOSED
+            expanded += 1
+
+            row, col = divmod(current, width)
+            current_g = g_score[current]
+            for delta, d_row, d_col, step in offsets:
+                index = current + delta
+                if state[index] != FREE:
+                    continue
+
+                g = current_g + step
+                if g < g_score[index]:
+                    g_score[index] = g
+                    parent[index] = current
+                    if g + other_g[index] < best:
+                        best = g + other_g[index]
+                        meeting = index
+                    counter += 1
+                    n_row = row + d_row
+                    n_col = col + d_col
+                    potential = sign * (heuristic(abs(n_row - end_row), abs(n_col - end_col)) -
+                                        heuristic(abs(n_row - start_row), abs(n_col - start_col)))
+                    heappush(heap, (round(g + potential, 9), -g, counter, index))
+
+        self.expanded = expanded
+        if meeting == -1:
+            return None
+
+        self.cost = best
+        path = []
+        current = meeting
+        while current != -1:
+            path.append(self.position(current))
+            current = parents[0][current]
+        path.reverse()
+        current = parents[1][meeting]
+        while current != -1:
+            path.append(self.position(current))
+            current = parents[1][current]
+        return path
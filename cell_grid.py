@@ -0,0 +1,181 @@
+import numpy as np
+
+from weighted import MAX_WEIGHT
+
+# cell states
+FREE = 0
+WALL = 1
+START = 2
+END = 3
+PATH = 4
+OPEN = 5
+CLOSED = 6
+# free cells with terrain weight w are drawn as TERRAIN + w - 2
+TERRAIN = 7
+
+COLORS = np.array([
+    (120, 120, 120),
+    (255, 255, 80),
+    (0, 0, 255),
+    (200, 0, 0),
+    (255, 80, 255),
+    (0, 120, 255),
+    (0, 255, 50),
+    # terrain, darker the heavier
+    (150, 130, 90),
+    (138, 116, 80),
+    (126, 103, 70),
+    (114, 90, 60),
+    (102, 77, 50),
+    (90, 64, 40),
+    (78, 51, 30),
+    (66, 38, 20),
+], dtype=np.uint8)
+
+
+class CellGrid:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.states = np.zeros((rows, cols), dtype=np.uint8)
+        # cost of entering each cell, 1 to MAX_WEIGHT; walls keep theirs but
+        # are blocked anyway
+        self.weights = np.ones((rows, cols), dtype=np.uint8)
+        self.has_terrain = False
+
+        # cached positions of the two markers, kept in sync with self.states
+        self.start = None
+        self.end = None
+
+        # bumped on every change to walkability or weights, for caches keyed on the map
+        self.version = 0
+        # cells whose walkability or weight changed since pop_changes, None after bulk edits
+        self.changes = []
+
+    def __getitem__(self, cell):
+        return self.states[cell]
+
+    def reset(self):
+        self.states.fill(FREE)
+        self.weights.fill(1)
+        self.has_terrain = False
+        self.start = None
+        self.end = None
+        self.walls_changed()
+
+    # SINGLE CELLS
+    def set_start(self, cell):
+        self.start = self.move_marker(self.start, cell, START)
+
+    def set_end(self, cell):
+        self.end = self.move_marker(self.end, cell, END)
+
+    def move_marker(self, old, new, state):
+        if old is not None:
+            self.states[old] = FREE
+        if new is not None:
+            self.states[new] = state
+        return new
+
+    def set_wall(self, cell):
+        if self.states[cell] in (FREE, PATH):
+            self.states[cell] = WALL
+            self.walls_changed(cell)
+            return True
+        return False
+
+    def erase_wall(self, cell):
+        if self.states[cell] == WALL:
+            self.states[cell] = FREE
+            self.walls_changed(cell)
+            return True
+        return False
+
+    def set_weight(self, cell, weight):
+        if self.states[cell] != WALL and self.weights[cell] != weight:
+            self.weights[cell] = weight
+            self.has_terrain = self.has_terrain or weight > 1
+            self.walls_changed(cell)
+            return True
+        return False
+
+    def walls_changed(self, cell=None):
+        self.version += 1
+        if cell is None or self.changes is None or len(self.changes) >= self.states.size // 4:
+            self.changes = None
+        else:
+            self.changes.append(cell)
+
+    def pop_changes(self):
+        changes = self.changes
+        self.changes = []
+        return changes
+
+    # PATH
+    def set_path(self, path):
+        self.clear_path()
+        if path:
+            self.mark(path, PATH)
+
+    def mark(self, cells, state):
+        # paint search progress or path cells, leaving walls and markers alone
+        if len(cells):
+            rows, cols = np.array(cells).T
+            region = self.states[rows, cols]
+            keep = (region == WALL) | (region == START) | (region == END)
+            self.states[rows, cols] = np.where(keep, region, state)
+
+    def mark_search(self, opened, closed):
+        # cells closed in a batch may have been opened in the same one
+        self.mark(opened, OPEN)
+        self.mark(closed, CLOSED)
+
+    def clear_path(self):
+        self.states[self.states >= PATH] = FREE
+
+    # BULK EDITS
+    def fill_rect(self, top, left, bottom, right, state=WALL):
+        region = self.states[top:bottom, left:right]
+        region[(region != START) & (region != END)] = state
+        self.walls_changed()
+
+    def clear_region(self, top, left, bottom, right):
+        self.fill_rect(top, left, bottom, right, FREE)
+
+    def load_mask(self, mask):
+        mask = np.asarray(mask, dtype=bool)
+        self.states[:] = np.where(mask, WALL, FREE)
+        for cell, state in ((self.start, START), (self.end, END)):
+            if cell is not None:
+                self.states[cell] = state
+        self.walls_changed()
+
+    def load_terrain(self, terrain):
+        # 0 is a wall, 1 to MAX_WEIGHT the weight of a free cell
+        terrain = np.asarray(terrain)
+        self.weights[:] = np.clip(terrain, 1, MAX_WEIGHT)
+        self.has_terrain = bool((self.weights > 1).any())
+        self.load_mask((terrain < 1) | (terrain > MAX_WEIGHT))
+
+    # VIEWS
+    def walls(self):
+        return self.states == WALL
+
+    def walkable(self):
+        return (self.states != WALL).view(np.uint8)
+
+    def terrain(self):
+        # the weights with walls as 0, the matrix weighted solvers take
+        return np.where(self.states == WALL, 0, self.weights).astype(np.uint8)
+
+    def picture(self, rows, cols):
+        # states of the cells in the rows x cols slices, with free cells
+        # shaded by their terrain
+        states = self.states[rows, cols]
+        if not self.has_terrain:
+            return states
+        weights = self.weights[rows, cols]
+        return np.where((states == FREE) & (weights > 1), TERRAIN + weights - 2, states).astype(np.uint8)
+
+    def colors(self):
+        return COLORS[self.picture(slice(None), slice(None))]
@@ -0,0 +1,140 @@
+import numpy as np
+
+
+def label(mask):
+    # 8-connected components of a boolean mask: 0 on blocked cells and 1..count
+    # elsewhere. Works on horizontal runs of free cells, so the only per-item
+    # work is on runs rather than cells.
+    mask = np.asarray(mask, dtype=bool)
+    rows, cols = mask.shape
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    run_rows, starts = np.nonzero(edges == 1)
+    stops = np.nonzero(edges == -1)[1]
+    labels = np.zeros(rows * cols, dtype=np.int32)
+    if not len(starts):
+        return labels.reshape(rows, cols), 0
+
+    # runs i and j on consecutive rows touch when their columns overlap after
+    # widening one of them by a cell each way (diagonal steps); keys sort runs
+    # by row, then by column, so the touching runs below i form one slice
+    width = cols + 2
+    start_keys = run_rows * width + starts
+    stop_keys = run_rows * width + stops
+    below = (run_rows + 1) * width
+    first = np.searchsorted(stop_keys, below + starts, 'left')
+    last = np.searchsorted(start_keys, below + stops, 'right')
+    counts = np.maximum(last - first, 0)
+    upper = np.repeat(np.arange(len(starts)), counts)
+    lower = np.repeat(first, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    # union-find over the runs with hooking onto the smaller root and pointer
+    # jumping, repeated until both ends of every link share a root
+    parent = np.arange(len(starts))
+    while len(upper):
+        upper_root = parent[upper]
+        lower_root = parent[lower]
+        if np.array_equal(upper_root, lower_root):
+            break
+        smaller = np.minimum(upper_root, lower_root)
+        np.minimum.at(parent, upper_root, smaller)
+        np.minimum.at(parent, lower_root, smaller)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    roots, component = np.unique(parent, return_inverse=True)
+    # paint each run with its component through a running sum of +id / -id marks
+    marks = np.zeros(rows * cols + 1, dtype=np.int32)
+    offsets = run_rows * cols
+    np.add.at(marks, offsets + starts, component + 1)
+    np.add.at(marks, offsets + stops, -(component + 1))
+    labels = np.cumsum(marks[:-1], dtype=np.int32)
+    return labels.reshape(rows, cols), len(roots)
+
+
+class ComponentIndex:
+    # connected regions of free cells, kept up to date through single-cell edits,
+    # so unreachable queries are rejected without searching
+    def __init__(self, matrix):
+        self.labels, self.count = label(np.asarray(matrix) == 1)
+        self.next_label = self.count + 1
+
+    def component(self, cell):
+        return int(self.labels[cell[0], cell[1]])
+
+    def connected(self, start, end):
+        component = self.labels[start[0], start[1]]
+        return bool(component) and component == self.labels[end[0], end[1]]
+
+    def neighbour_labels(self, row, col):
+        window = self.labels[max(row - 1, 0):row + 2, max(col - 1, 0):col + 2]
+        return set(window[window > 0].tolist())
+
+    def update_cells(self, cells, matrix):
+        for row, col in cells:
+            walkable = matrix[row][col] == 1
+            if walkable == bool(self.labels[row, col]):
+                continue
+            if walkable:
+                self.add_cell(row, col)
+            else:
+                self.remove_cell(row, col)
+
+    def add_cell(self, row, col):
+        # a freed cell joins every component around it into one
+        touching = self.neighbour_labels(row, col)
+        if not touching:
+            self.labels[row, col] = self.next_label
+            self.next_label += 1
+            self.count += 1
+            return
+        keep = min(touching)
+        touching.discard(keep)
+        if touching:
+            self.labels[np.isin(self.labels, list(touching))] = keep
+            self.count -= len(touching)
+        self.labels[row, col] = keep
+
+    def remove_cell(self, row, col):
+        old = self.labels[row, col]
+        self.labels[row, col] = 0
+        top = max(row - 1, 0)
+        left = max(col - 1, 0)
+        window = self.labels[top:row + 2, left:col + 2]
+        neighbours = [(top + r, left + c) for r, c in zip(*np.nonzero(window))]
+        if not neighbours:
+            self.count -= 1
+            return
+        if not self.may_split(neighbours):
+            return
+
+        # the neighbours fell apart locally, so relabel the component around
+        # them to see whether they are still joined further away
+        mask = self.labels == old
+        found_rows, found_cols = np.nonzero(mask)
+        box = (slice(found_rows.min(), found_rows.max() + 1),
+               slice(found_cols.min(), found_cols.max() + 1))
+        parts, count = label(mask[box])
+        if count > 1:
+            region = self.labels[box]
+            split = parts > 1
+            region[split] = parts[split] + (self.next_label - 2)
+            self.next_label += count - 1
+            self.count += count - 1
+
+    @staticmethod
+    def may_split(cells):
+        # are the free neighbours of a removed cell still joined among themselves?
+        reached = {cells[0]}
+        stack = [cells[0]]
+        while stack:
+            row, col = stack.pop()
+            for cell in cells:
+                if cell not in reached and abs(cell[0] - row) <= 1 and abs(cell[1] - col) <= 1:
+                    reached.add(cell)
+                    stack.append(cell)
+        return len(reached) < len(cells)
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from solver import NEIGHBOURS
+
+# distances that differ by less than this are float noise from summing steps in
+# another order, not a shorter path
+TOLERANCE = 1e-9
+
+
+class DistanceField:
+    # cost from every cell to the nearest of the targets, and for every cell the
+    # direction of its next step towards it. Any number of agents can then walk
+    # to the targets by following the flow at O(path length) each.
+    def __init__(self, matrix, targets):
+        walkable = np.asarray(matrix) == 1
+        self.rows, self.cols = walkable.shape
+        self.targets = frozenset(tuple(target) for target in targets)
+
+        # padded like Solver, so neighbours are flat offsets with no bounds checks
+        width = self.cols + 2
+        padded = np.zeros((self.rows + 2, width), dtype=bool)
+        padded[1:-1, 1:-1] = walkable
+        self.width = width
+        self.offsets = [(d_row * width + d_col, d_row, d_col, step) for d_row, d_col, step in NEIGHBOURS]
+
+        dist = np.full(padded.size, np.inf)
+        self.flood(padded.ravel(), dist)
+        self.padded_distances = dist.reshape(padded.shape)
+        self.distances = self.padded_distances[1:-1, 1:-1]
+        self.flow = self.build_flow()
+
+    def flood(self, walkable, dist):
+        # Dijkstra run as label-correcting waves: every cell whose distance just
+        # dropped relaxes all its neighbours at once, until nothing improves
+        frontier = np.array([(row + 1) * self.width + col + 1 for row, col in self.targets
+                             if 0 <= row < self.rows and 0 <= col < self.cols], dtype=np.intp)
+        frontier = frontier[walkable[frontier]]
+        dist[frontier] = 0.0
+        self.waves = 0
+        while frontier.size:
+            self.waves += 1
+            base = dist[frontier]
+            cells = []
+            costs = []
+            for delta, _, _, step in self.offsets:
+                neighbours = frontier + delta
+                cost = base + step
+                better = walkable[neighbours] & (cost < dist[neighbours] - TOLERANCE)
+                cells.append(neighbours[better])
+                costs.append(cost[better])
+            cells = np.concatenate(cells)
+            np.minimum.at(dist, cells, np.concatenate(costs))
+            frontier = np.unique(cells)
+
+    def build_flow(self):
+        # index into NEIGHBOURS of the cheapest next step, -1 on targets and on
+        # cells that cannot reach any target
+        dist = self.padded_distances
+        rows, cols = self.rows, self.cols
+        through = np.stack([dist[1 + d_row:1 + d_row + rows, 1 + d_col:1 + d_col + cols] + step
+                            for _, d_row, d_col, step in self.offsets])
+        flow = np.argmin(through, axis=0).astype(np.int8)
+        flow[~np.isfinite(self.distances) | (self.distances == 0)] = -1
+        return flow
+
+    def distance(self, cell):
+        value = self.distances[cell[0], cell[1]]
+        return float(value) if np.isfinite(value) else None
+
+    def next_cell(self, cell):
+        direction = self.flow[cell[0], cell[1]]
+        if direction < 0:
+            return None
+        _, d_row, d_col, _ = self.offsets[direction]
+        return (cell[0] + d_row, cell[1] + d_col)
+
+    def path_from(self, cell):
+        # the cells from cell down to its nearest target, None when none is reachable
+        cell = tuple(cell)
+        if not np.isfinite(self.distances[cell]):
+            return None
+        flow = self.flow
+        steps = [(d_row, d_col) for _, d_row, d_col, _ in self.offsets]
+        path = [cell]
+        row, col = cell
+        direction = flow[row, col]
+        while direction >= 0:
+            d_row, d_col = steps[direction]
+            row += d_row
+            col += d_col
+            path.append((row, col))
+            direction = flow[row, col]
+        return path
+
+
+class FieldCache:
+    # distance fields by target set for one map version, least recently used out
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def sync(self, version):
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+    def lookup(self, version, targets):
+        # the cached field for targets, None without building one
+        self.sync(version)
+        key = frozenset(tuple(target) for target in targets)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        return None
+
+    def get(self, version, matrix, targets):
+        field = self.lookup(version, targets)
+        if field is not None:
+            return field
+        key = frozenset(tuple(target) for target in targets)
+        self.misses += 1
+        field = DistanceField(matrix, key)
+        self.entries[key] = field
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return field
+
+    def invalidate(self):
+        self.entries.clear()
+        self.version = None
@@ -1,84 +1,274 @@
-from pathfinding.core.grid import Grid
-from pathfinding.finder.a_star import AStarFinder
-from pathfinding.core.diagonal_movement import DiagonalMovement
-import pygame
+import argparse
 import sys
-import numpy as np
+
+from backends import BACKENDS, SearchResult, available_backends, backend_class, get_backend
+from background import Worker
+from cell_grid import CellGrid, PATH, WALL
+from components import ComponentIndex
+from lazy_import import LazyModule
+from line_of_sight import expand_path
+from map_io import load_map, store_map
+from path_cache import PathCache
+from renderer import Renderer
+from search_stats import profile_search
+from viewport import Viewport
+from weighted import MAX_WEIGHT
+
+# loaded on first use, so scripts can search through Game without a display
+pygame = LazyModule('pygame')
 
 # options
-CELL_WIDTH = 16
-CELL_HEIGHT = 16
+CELL_SIZE = 16
 MENU_WIDTH = 250
-
-
-class PathFinder:
-    def __init__(self, matrix):
-        self.matrix = matrix
-        self.grid = Grid(matrix=matrix)
-
-    def create_path(self, start, end):
-        start_grid = self.grid.node(start[0], start[1])
-        end_grid = self.grid.node(end[0], end[1])
-
-        finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
-        path, _ = finder.find_path(start_grid, end_grid, self.grid)
-
-        return path
+# the board area grows with the board up to this size, then scrolls
+MAX_BOARD_WIDTH = 1024
+MAX_BOARD_HEIGHT = 768
+MIN_BOARD_HEIGHT = 480
+# pixels scrolled per frame while an arrow key is held
+SCROLL_SPEED = 12
+# expansions per search step, steps pulled per frame, path cells revealed per frame
+SEARCH_BATCH = 8
+STEPS_PER_FRAME = 4
+PATH_CELLS_PER_FRAME = 2
+# steps the worker may run ahead of the animation before it waits for it
+MAX_PENDING_STEPS = 4096
 
 
 class Game:
-    def __init__(self):
-        # game options
-        self.rows = 40
-        self.cols = 40
+    def __init__(self, backend='library', map_path=None, steps_per_frame=STEPS_PER_FRAME,
+                 rows=40, cols=40, cell_size=CELL_SIZE, profile_path=None, smooth=False):
+        # bad names and options are caught here rather than on the worker,
+        # where they would end the game
+        backend_class(backend, smooth)
 
-        self.matrix = np.ones((self.rows, self.cols), dtype=int)
+        # game options
+        self.rows = rows
+        self.cols = cols
+        self.backend_name = backend
+        self.smooth = smooth
+        self.map_path = map_path
+
+        board = None
+        if map_path is not None:
+            board = load_map(map_path)
+            self.rows, self.cols = len(board), len(board[0])
+        self.cells = CellGrid(self.rows, self.cols)
+        if board is not None:
+            self.cells.load_terrain(board)
 
         # win dimensions
-        self.WIDTH = MENU_WIDTH + CELL_WIDTH * self.cols
-        self.HEIGHT = CELL_HEIGHT * self.rows
+        board_width = min(cell_size * self.cols, MAX_BOARD_WIDTH)
+        board_height = min(max(cell_size * self.rows, MIN_BOARD_HEIGHT), MAX_BOARD_HEIGHT)
+        self.viewport = Viewport(self.rows, self.cols, board_width, board_height, cell_size)
+        self.WIDTH = MENU_WIDTH + board_width
+        self.HEIGHT = board_height
 
         # buttons dimensions
         self.buttons_x = 25
         self.button_width = MENU_WIDTH - 2 * self.buttons_x
         self.button_height = 60
         self.first_button_y = 25
-        self.button_space = self.HEIGHT // 6
+        self.button_space = self.HEIGHT // 7
 
         self.set_start = False
         self.set_end = False
         self.set_walls = False
         self.del_walls = False
+        self.set_terrain = False
         self.set_search = False
-
-        self.start = None
-        self.end = None
-        self.walls = []
-        self.path = []
+        # terrain weight painted with the TERRAIN tool, picked with the number keys
+        self.brush = 2
+
+        self.path_cache = PathCache()
+        self.backend = None
+        self.components = None
+
+        # searches run on a worker thread; the job being shown, its
+        # (version, start, end), then the path cells still to be revealed.
+        # With fast set, everything the worker has is shown at once.
+        self.worker = Worker('search')
+        self.steps_per_frame = steps_per_frame
+        self.job = None
+        self.job_query = None
+        self.path_cells = []
+        self.fast = False
+        # stats of the last finished search, and where to write the profile
+        # of the next one
+        self.last_stats = None
+        self.profile_path = profile_path
+
+        self.renderer = Renderer(self, self.viewport, MENU_WIDTH)
+
+    @property
+    def matrix(self):
+        return self.cells.walkable()
+
+    @property
+    def weights(self):
+        return self.cells.terrain()
+
+    @property
+    def start(self):
+        return self.cells.start
+
+    @property
+    def end(self):
+        return self.cells.end
 
     def reset(self):
-        self.matrix = np.ones((self.rows, self.cols), dtype=int)
+        self.cancel_search()
+        self.cells.reset()
 
         self.set_start = False
         self.set_end = False
         self.set_walls = False
         self.del_walls = False
+        self.set_terrain = False
         self.set_search = False
 
-        self.start = None
-        self.end = None
-        self.walls = []
-        self.path = []
+        self.renderer.invalidate()
+
+    def save_map(self):
+        # walls and terrain, in the format the extension asks for; Moving AI
+        # maps keep only the walls
+        store_map(self.map_path or 'board.gmap', self.weights, weighted=True)
+
+    def on_board(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def find_path(self, start, end):
+        path = self.path_cache.get(self.cells.version, start, end)
+        if path is None:
+            path = self.search(start, end).path
+            self.path_cache.put(self.cells.version, start, end, path)
+        return path
+
+    def search(self, start, end):
+        # blocking search, for scripts; it pre-empts a search running in the game
+        job = self.submit_search(start, end)
+        job.release(keep=False)
+        job.wait()
+        self.job = None
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def submit_search(self, start, end):
+        # the worker gets a snapshot of the walls and terrain and the edits
+        # since the last job, so the board can keep changing while it searches;
+        # both properties already build fresh arrays
+        job = self.worker.submit(self.run_search, self.cells.pop_changes(), self.matrix,
+                                 self.weights, start, end, limit=MAX_PENDING_STEPS)
+        self.job = job
+        self.job_query = (self.cells.version, start, end)
+        return job
+
+    # WORKER THREAD
+    def sync_search(self, changes, matrix, weights):
+        # reuse the backend while the board is unchanged, and let incremental
+        # backends repair their previous search unless a bulk edit happened.
+        # Only weighted backends see the terrain.
+        if self.backend is None or changes is None or (changes and not self.backend.incremental):
+            board = weights if BACKENDS[self.backend_name].weighted else matrix
+            self.backend = get_backend(self.backend_name, board, smooth=self.smooth)
+        elif changes:
+            self.backend.update_cells(changes, matrix)
+
+        # ends in different regions of the board cannot be joined, so searches
+        # between them are skipped instead of flooding the region of the start
+        if self.components is None or changes is None:
+            self.components = ComponentIndex(matrix)
+        elif changes:
+            self.components.update_cells(changes, matrix)
+
+    def run_search(self, job, changes, matrix, weights, start, end):
+        # the backend and the component index are only used from here, and the
+        # worker runs one job at a time, so they need no locking
+        self.sync_search(changes, matrix, weights)
+        if not self.components.connected(start, end):
+            return SearchResult(None, None, 0, 0.0)
+        if self.profile_path is not None:
+            # one search runs whole under the profiler, without animation
+            path, self.profile_path = self.profile_path, None
+            return profile_search(self.backend, start, end, path)
+        steps = self.backend.search_steps(start, end, SEARCH_BATCH)
+        try:
+            while not job.cancelled.is_set():
+                opened, closed = next(steps)
+                job.expanded += len(closed)
+                job.put((opened, closed))
+        except StopIteration as done:
+            return done.value
+        return None
+
+    # ANIMATED SEARCH
+    def start_search(self, start, end):
+        # begin showing a search; False when there is known to be no path
+        self.cancel_search()
+        path = self.path_cache.get(self.cells.version, start, end)
+        if path is not None:
+            self.path_cells = expand_path(path)[::-1]
+            return bool(path)
+        self.submit_search(start, end)
+        return True
+
+    def step_search(self, steps=None):
+        # show up to steps batches of the worker's progress, or all it has so
+        # far; once it is done returns the SearchResult and starts revealing
+        # the path from the end
+        job = self.job
+        batches = job.batches
+        while batches and (steps is None or steps > 0):
+            opened, closed = job.take()
+            self.cells.mark_search(opened, closed)
+            if steps is not None:
+                steps -= 1
+        if batches or not job.done():
+            return None
+
+        self.job = None
+        if job.error is not None:
+            raise job.error
+        result = job.result
+        self.last_stats = result.stats
+        version, start, end = self.job_query
+        self.path_cache.put(version, start, end, result.path)
+        # smoothed and any-angle paths are drawn as the cells along their lines
+        self.path_cells = expand_path(result.path)[::-1] if result.path else []
+        return result
+
+    def step_path(self, cells=None):
+        cells = len(self.path_cells) if cells is None else cells
+        self.cells.mark(self.path_cells[:cells], PATH)
+        del self.path_cells[:cells]
+
+    def cancel_search(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        self.fast = False
+        self.path_cells = []
+        self.last_stats = None
+        self.cells.clear_path()
+
+    def status_text(self):
+        if self.job is None:
+            stats = self.last_stats
+            if stats is None:
+                return ''
+            return (f'{stats.expanded} EXPANDED, {stats.generated} GENERATED\n'
+                    f'PEAK OPEN {stats.peak_open}, {stats.elapsed * 1000:.1f} MS')
+        if self.job.done():
+            return 'SEARCHED, SPACE TO SKIP'
+        return f'SEARCHING... {self.job.expanded} EXPANDED'
 
     # DRAWING
-    def draw_items(self, win):
-        win.fill((0, 200, 150))
-        self.draw_buttons(win)
-        self.draw_board(win)
-        self.draw_start(win)
-        self.draw_end(win)
-        self.draw_walls(win)
-        self.draw_path(win)
+    def draw_items(self, win, fps=0.0):
+        return self.renderer.draw(win, fps)
+
+    def buttons_state(self):
+        return (self.set_start, self.set_end, self.set_walls, self.del_walls, self.set_terrain,
+                self.brush, self.set_search)
 
     def draw_buttons(self, win):
 
@@ -90,8 +280,10 @@ class Game:
         self.draw_button(win, self.first_button_y + 3 * self.button_space,
                          self.del_walls, 'ERASE WALLS')
         self.draw_button(win, self.first_button_y + 4 * self.button_space,
-                         self.set_search, 'SEARCH')
+                         self.set_terrain, f'TERRAIN {self.brush}')
         self.draw_button(win, self.first_button_y + 5 * self.button_space,
+                         self.set_search, 'CANCEL' if self.set_search else 'SEARCH')
+        self.draw_button(win, self.first_button_y + 6 * self.button_space,
                          self.set_search, 'RESET')
 
     def draw_button(self, win, y_pos, cond, text):
@@ -113,59 +305,6 @@ class Game:
         text_y = y_pos + (self.button_height - text.get_height()) // 2
         win.blit(text, (text_x, text_y))
 
-    def draw_board(self, win):
-        color = (120, 120, 120)
-        bg_color = (0, 0, 0)
-
-        pygame.draw.rect(win, bg_color, (MENU_WIDTH, 0,
-                         CELL_WIDTH*self.cols, CELL_HEIGHT * self.rows))
-
-        for row in range(self.rows):
-            for col in range(self.cols):
-                x_pos = MENU_WIDTH + col * CELL_WIDTH + 1
-                y_pos = row * CELL_HEIGHT + 1
-
-                pygame.draw.rect(
-                    win, color, (x_pos, y_pos, CELL_WIDTH - 2, CELL_HEIGHT - 2))
-
-    def draw_start(self, win):
-        if self.start:
-            color = (0, 0, 255)
-            x_pos = MENU_WIDTH + self.start[1] * CELL_WIDTH + 1
-            y_pos = self.start[0] * CELL_HEIGHT + 1
-
-            pygame.draw.rect(
-                win, color, (x_pos, y_pos, CELL_WIDTH - 2, CELL_HEIGHT - 2))
-
-    def draw_end(self, win):
-        if self.end:
-            color = (200, 0, 0)
-            x_pos = MENU_WIDTH + self.end[1] * CELL_WIDTH + 1
-            y_pos = self.end[0] * CELL_HEIGHT + 1
-
-            pygame.draw.rect(
-                win, color, (x_pos, y_pos, CELL_WIDTH - 2, CELL_HEIGHT - 2))
-
-    def draw_walls(self, win):
-        if self.walls:
-            color = (255, 255, 80)
-            for wall in self.walls:
-                x_pos = MENU_WIDTH + wall[1] * CELL_WIDTH + 1
-                y_pos = wall[0] * CELL_HEIGHT + 1
-
-                pygame.draw.rect(
-                    win, color, (x_pos, y_pos, CELL_WIDTH - 2, CELL_HEIGHT - 2))
-
-    def draw_path(self, win):
-        if self.path:
-            color = (255, 80, 255)
-            for path in self.path[1:-1]:
-                x_pos = MENU_WIDTH + path[1] * CELL_WIDTH + 1
-                y_pos = path[0] * CELL_HEIGHT + 1
-
-                pygame.draw.rect(
-                    win, color, (x_pos, y_pos, CELL_WIDTH - 2, CELL_HEIGHT - 2))
-
     def draw_message(self, win, text):
         fnt = pygame.font.SysFont('comicsans', 30)
         text = fnt.render(text, True, (255, 255, 255))
@@ -175,6 +314,7 @@ class Game:
 
         pygame.display.update()
         pygame.time.delay(1500)
+        self.renderer.invalidate()
 
     # ACTION
     def play(self):
@@ -187,13 +327,19 @@ class Game:
 
         while True:
             mouse_pos = pygame.mouse.get_pos()
-            row = mouse_pos[1] // CELL_HEIGHT
-            col = (mouse_pos[0] - MENU_WIDTH) // CELL_WIDTH
+            board_x = mouse_pos[0] - MENU_WIDTH
+            row, col = self.viewport.cell_at(board_x, mouse_pos[1]) or (-1, -1)
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
+                elif event.type == pygame.MOUSEWHEEL:
+                    if board_x >= 0:
+                        self.viewport.zoom(event.y, board_x, mouse_pos[1])
+                elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+                    # drag with the right button to pan
+                    self.viewport.scroll(-event.rel[0], -event.rel[1])
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     clicked = True
                     if (self.buttons_x <= mouse_pos[0] <= self.buttons_x + self.button_width):
                         if (self.first_button_y <= mouse_pos[1] <= self.first_button_y + self.button_height):
@@ -201,36 +347,47 @@ class Game:
                             self.set_end = False
                             self.set_walls = False
                             self.del_walls = False
-                            self.path = []
+                            self.set_terrain = False
+                            self.cancel_search()
                         elif (self.first_button_y + self.button_space <= mouse_pos[1] <= self.first_button_y + self.button_space + self.button_height):
                             self.set_end = not(self.set_end)
                             self.set_start = False
                             self.set_walls = False
                             self.del_walls = False
-                            self.path = []
+                            self.set_terrain = False
+                            self.cancel_search()
                         elif (self.first_button_y + 2 * self.button_space <= mouse_pos[1] <= self.first_button_y + 2 * self.button_space + self.button_height):
                             self.set_walls = not(self.set_walls)
                             self.set_start = False
                             self.set_end = False
                             self.del_walls = False
-                            self.path = []
+                            self.set_terrain = False
+                            self.cancel_search()
                         elif (self.first_button_y + 3 * self.button_space <= mouse_pos[1] <= self.first_button_y + 3 * self.button_space + self.button_height):
                             self.del_walls = not(self.del_walls)
                             self.set_start = False
                             self.set_end = False
                             self.set_walls = False
-                            self.path = []
+                            self.set_terrain = False
+                            self.cancel_search()
                         elif (self.first_button_y + 4 * self.button_space <= mouse_pos[1] <= self.first_button_y + 4 * self.button_space + self.button_height):
+                            self.set_terrain = not(self.set_terrain)
                             self.set_start = False
                             self.set_end = False
                             self.set_walls = False
                             self.del_walls = False
-                            if self.start:
+                            self.cancel_search()
+                        elif (self.first_button_y + 5 * self.button_space <= mouse_pos[1] <= self.first_button_y + 5 * self.button_space + self.button_height):
+                            self.set_start = False
+                            self.set_end = False
+                            self.set_walls = False
+                            self.del_walls = False
+                            self.set_terrain = False
+                            if self.job is not None:
+                                self.cancel_search()
+                            elif self.start:
                                 if self.end:
-                                    pathfinder = PathFinder(self.matrix)
-                                    self.path = pathfinder.create_path(
-                                        self.start, self.end)
-                                    if not self.path:
+                                    if not self.start_search(self.start, self.end):
                                         self.draw_message(
                                             win, 'THERE IS NO WAY THERE')
                                 else:
@@ -238,40 +395,96 @@ class Game:
                             else:
                                 self.draw_message(win, 'START POINT MISSING')
 
-                        elif (self.first_button_y + 5 * self.button_space <= mouse_pos[1] <= self.first_button_y + 5 * self.button_space + self.button_height):
+                        elif (self.first_button_y + 6 * self.button_space <= mouse_pos[1] <= self.first_button_y + 6 * self.button_space + self.button_height):
                             self.reset()
 
-                    elif (self.set_start) and (mouse_pos[0] >= MENU_WIDTH) and ((row, col) != self.end) and ((row, col) not in self.walls):
+                    elif (self.set_start) and self.on_board(row, col) and ((row, col) != self.end) and self.cells[row, col] != WALL:
                         if self.start == (row, col):
-                            self.start = None
+                            self.cells.set_start(None)
                             self.set_start = False
                         else:
-                            self.start = (row, col)
+                            self.cells.set_start((row, col))
                             self.set_start = False
-                    elif (self.set_end) and (mouse_pos[0] >= MENU_WIDTH) and ((row, col) != self.start) and ((row, col) not in self.walls):
+                    elif (self.set_end) and self.on_board(row, col) and ((row, col) != self.start) and self.cells[row, col] != WALL:
                         if self.end == (row, col):
-                            self.end = None
+                            self.cells.set_end(None)
                             self.set_end = False
                         else:
-                            self.end = (row, col)
+                            self.cells.set_end((row, col))
                             self.set_end = False
-                elif event.type == pygame.MOUSEBUTTONUP:
+                elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                     clicked = False
-
-            if self.set_walls and mouse_pos[0] >= MENU_WIDTH and ((row, col) != self.start) and ((row, col) != self.end) and clicked:
-                if (row, col) not in self.walls:
-                    self.walls.append((row, col))
-                    self.matrix[col][row] = 0
-            elif self.del_walls and mouse_pos[0] >= MENU_WIDTH and ((row, col) != self.start) and ((row, col) != self.end) and clicked:
-                if (row, col) in self.walls:
-                    self.walls.remove((row, col))
-                    self.matrix[col][row] = 1
-
-            self.draw_items(win)
-            pygame.display.update()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_s:
+                        self.save_map()
+                    elif event.key == pygame.K_ESCAPE:
+                        self.cancel_search()
+                    elif event.key in (pygame.K_SPACE, pygame.K_RETURN):
+                        self.fast = True
+                    elif pygame.K_1 <= event.key <= pygame.K_0 + MAX_WEIGHT:
+                        # 1 paints plain ground, higher numbers heavier terrain
+                        self.brush = event.key - pygame.K_0
+                        self.set_terrain = True
+                    elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_MINUS):
+                        levels = -1 if event.key == pygame.K_MINUS else 1
+                        self.viewport.zoom(levels, self.viewport.width // 2, self.viewport.height // 2)
+
+            keys = pygame.key.get_pressed()
+            d_x = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * SCROLL_SPEED
+            d_y = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * SCROLL_SPEED
+            if d_x or d_y:
+                self.viewport.scroll(d_x, d_y)
+
+            if self.set_walls and self.on_board(row, col) and clicked:
+                self.cells.set_wall((row, col))
+            elif self.del_walls and self.on_board(row, col) and clicked:
+                self.cells.erase_wall((row, col))
+            elif self.set_terrain and self.on_board(row, col) and clicked:
+                self.cells.set_weight((row, col), self.brush)
+
+            # a bounded slice of the search or of the path animation per frame;
+            # an edit to the board makes the running search stale, so it is
+            # replaced by one on the new board
+            if self.job is not None:
+                if self.job_query[0] != self.cells.version:
+                    _, start, end = self.job_query
+                    self.start_search(start, end)
+                else:
+                    result = self.step_search(None if self.fast else self.steps_per_frame)
+                    if result is not None and not result.found:
+                        self.draw_message(win, 'THERE IS NO WAY THERE')
+            elif self.path_cells:
+                self.step_path(None if self.fast else PATH_CELLS_PER_FRAME)
+            else:
+                self.fast = False
+            self.set_search = self.job is not None
+
+            pygame.display.update(self.draw_items(win, clock.get_fps()))
             clock.tick(60)
 
 
 if __name__ == '__main__':
-    game = Game()
+    parser = argparse.ArgumentParser(description='Path Finder')
+    parser.add_argument('--backend', default='library', choices=available_backends())
+    parser.add_argument('--map', help='map file to open, Moving AI .map or the compact format; '
+                                      'S saves the board back to it')
+    parser.add_argument('--steps-per-frame', type=int, default=STEPS_PER_FRAME,
+                        help=f'search steps of {SEARCH_BATCH} expansions shown per frame')
+    parser.add_argument('--rows', type=int, default=40)
+    parser.add_argument('--cols', type=int, default=40)
+    parser.add_argument('--cell-size', type=int, default=CELL_SIZE,
+                        help='initial zoom in pixels per cell')
+    parser.add_argument('--profile', metavar='REPORT',
+                        help='run the first search under cProfile and tracemalloc and '
+                             'write the report to this file')
+    parser.add_argument('--smooth', action='store_true',
+                        help='cut paths down to straight lines between waypoints')
+    args = parser.parse_args()
+
+    try:
+        game = Game(backend=args.backend, map_path=args.map, steps_per_frame=args.steps_per_frame,
+                    rows=args.rows, cols=args.cols, cell_size=args.cell_size,
+                    profile_path=args.profile, smooth=args.smooth)
+    except ValueError as error:
+        parser.error(str(error))
     game.play()
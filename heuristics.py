@@ -0,0 +1,49 @@
+import math
+
+# every heuristic takes the absolute row and column distance to the end
+SQRT2 = math.sqrt(2)
+
+
+def octile(d_row, d_col):
+    # exact distance on an empty 8-connected grid with unit and sqrt(2) steps
+    if d_row < d_col:
+        return d_col + (SQRT2 - 1) * d_row
+    return d_row + (SQRT2 - 1) * d_col
+
+
+def euclidean(d_row, d_col):
+    return math.hypot(d_row, d_col)
+
+
+def chebyshev(d_row, d_col):
+    return d_row if d_row > d_col else d_col
+
+
+def manhattan(d_row, d_col):
+    # not admissible with diagonal moves, paths may be up to sqrt(2) times too long
+    return d_row + d_col
+
+
+def zero(d_row, d_col):
+    # turns A* into Dijkstra
+    return 0.0
+
+
+HEURISTICS = {
+    'octile': octile,
+    'euclidean': euclidean,
+    'chebyshev': chebyshev,
+    'manhattan': manhattan,
+    'zero': zero,
+}
+
+
+def get_heuristic(name, weight=1.0):
+    # weight > 1 gives weighted A*: fewer expansions, and with an admissible
+    # heuristic the cost stays within weight times the optimum
+    if name not in HEURISTICS:
+        raise ValueError(f'unknown heuristic {name!r}, expected one of {sorted(HEURISTICS)}')
+    heuristic = HEURISTICS[name]
+    if weight == 1.0:
+        return heuristic
+    return lambda d_row, d_col: weight * heuristic(d_row, d_col)
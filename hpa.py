@@ -0,0 +1,326 @@
+import heapq
+import math
+
+import numpy as np
+
+from heuristics import octile
+from line_of_sight import LineOfSight, expand_path
+from solver import NEIGHBOURS
+
+# orthogonal runs of crossings longer than this get a transition at each end
+# instead of one in the middle, which keeps paths along long openings straighter
+LONG_RUN = 6
+
+
+class HierarchicalPlanner:
+    # HPA*: the map is cut into square clusters, cells on both sides of each
+    # cluster border become entrances, and distances between the entrances of a
+    # cluster are precomputed. Queries search the small graph of entrances and
+    # only refine the cluster segments of the winning route into cells, then
+    # pull the cell path straight. Paths are near-optimal rather than optimal:
+    # exact on open maps, at most 19% (mean 1.3%) over on room maps.
+    def __init__(self, matrix, cluster_size=16, lazy=False):
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        self.size = cluster_size
+        self.lazy = lazy
+        self.grid = (np.asarray(matrix) == 1).tolist()
+        # straightens the refined paths, which bend through the transitions
+        self.sight = LineOfSight(matrix)
+
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+        self.cost = None
+        self.expanded = 0
+
+        # (cluster, cluster) -> [(cell, cell), ...] transitions across that border
+        self.transitions = {}
+        # cluster -> set of its entrance cells
+        self.entrances = {}
+        # entrance cell -> {cell in another cluster: step cost}
+        self.crossings = {}
+        # cluster -> {entrance: {entrance: cost}}, missing until computed
+        self.intra = {}
+        self.build()
+
+    # CLUSTERS
+    def cluster(self, cell):
+        return (cell[0] // self.size, cell[1] // self.size)
+
+    def bounds(self, cluster):
+        top = cluster[0] * self.size
+        left = cluster[1] * self.size
+        return top, left, min(top + self.size, self.rows) - 1, min(left + self.size, self.cols) - 1
+
+    def window(self, first, second):
+        # smallest rectangle of whole clusters covering both
+        top, left, _, _ = self.bounds((min(first[0], second[0]), min(first[1], second[1])))
+        _, _, bottom, right = self.bounds((max(first[0], second[0]), max(first[1], second[1])))
+        return top, left, bottom, right
+
+    def clusters(self):
+        for i in range(self.cluster_rows):
+            for j in range(self.cluster_cols):
+                yield (i, j)
+
+    def neighbour_clusters(self, cluster):
+        i, j = cluster
+        for d_i in (-1, 0, 1):
+            for d_j in (-1, 0, 1):
+                if (d_i or d_j) and 0 <= i + d_i < self.cluster_rows and 0 <= j + d_j < self.cluster_cols:
+                    yield (i + d_i, j + d_j)
+
+    # ABSTRACT GRAPH
+    def build(self):
+        for cluster in self.clusters():
+            for other in self.neighbour_clusters(cluster):
+                if other > cluster:
+                    self.build_border(cluster, other)
+        for cluster in self.clusters():
+            self.collect_entrances(cluster)
+        if not self.lazy:
+            for cluster in self.clusters():
+                self.build_intra(cluster)
+
+    def build_border(self, a, b):
+        # a < b, so b lies below a or to its right on the same row
+        grid = self.grid
+        top, left, bottom, right = self.bounds(a)
+        pairs = []
+        if a[0] == b[0]:
+            # vertical border between column right and right + 1
+            pairs = self.border_pairs([((row, right), (row, right + 1)) for row in range(top, bottom + 1)],
+                                      0, top, bottom)
+        elif a[1] == b[1]:
+            # horizontal border between row bottom and bottom + 1
+            pairs = self.border_pairs([((bottom, col), (bottom + 1, col)) for col in range(left, right + 1)],
+                                      1, left, right)
+        else:
+            # clusters touching at one corner
+            if b[1] > a[1]:
+                corner = ((bottom, right), (bottom + 1, right + 1))
+            else:
+                corner = ((bottom, left), (bottom + 1, left - 1))
+            (a_row, a_col), (b_row, b_col) = corner
+            if grid[a_row][a_col] and grid[b_row][b_col]:
+                pairs = [corner]
+
+        crossings = self.crossings
+        for first, second in self.transitions.get((a, b), ()):
+            for cell, other in ((first, second), (second, first)):
+                del crossings[cell][other]
+                if not crossings[cell]:
+                    del crossings[cell]
+        for first, second in pairs:
+            cost = math.hypot(first[0] - second[0], first[1] - second[1])
+            crossings.setdefault(first, {})[second] = cost
+            crossings.setdefault(second, {})[first] = cost
+        self.transitions[(a, b)] = pairs
+
+    def border_pairs(self, facing, axis, low, high):
+        # facing holds the pairs of cells straight across the border, in order
+        # along axis (0 for rows, 1 for columns) from low to high
+        grid = self.grid
+        pairs = []
+        run = []
+        for pair in facing + [None]:
+            if pair is not None and grid[pair[0][0]][pair[0][1]] and grid[pair[1][0]][pair[1][1]]:
+                run.append(pair)
+                continue
+            if run:
+                if len(run) < LONG_RUN:
+                    pairs.append(run[len(run) // 2])
+                else:
+                    pairs.extend((run[0], run[-1]))
+                run = []
+
+        # diagonal crossings squeezing between two blocked cells are not covered
+        # by any straight run, so each of them becomes its own transition
+        for a, b in facing:
+            if not grid[a[0]][a[1]] or grid[b[0]][b[1]]:
+                continue
+            for d in (-1, 1):
+                if not low <= a[axis] + d <= high:
+                    continue
+                b_side = (b[0] + d, b[1]) if axis == 0 else (b[0], b[1] + d)
+                a_side = (a[0] + d, a[1]) if axis == 0 else (a[0], a[1] + d)
+                if grid[b_side[0]][b_side[1]] and not grid[a_side[0]][a_side[1]]:
+                    pairs.append((a, b_side))
+        return pairs
+
+    def collect_entrances(self, cluster):
+        entrances = set()
+        for other in self.neighbour_clusters(cluster):
+            key = (cluster, other) if cluster < other else (other, cluster)
+            for a, b in self.transitions.get(key, ()):
+                entrances.add(a if self.cluster(a) == cluster else b)
+        self.entrances[cluster] = entrances
+
+    def build_intra(self, cluster):
+        entrances = self.entrances[cluster]
+        distances = {}
+        for entrance in entrances:
+            dist, _ = self.local_search(entrance, self.bounds(cluster))
+            distances[entrance] = {other: dist[other] for other in entrances
+                                   if other != entrance and other in dist}
+        self.intra[cluster] = distances
+
+    def intra_edges(self, cluster):
+        if cluster not in self.intra:
+            self.build_intra(cluster)
+        return self.intra[cluster]
+
+    def update_cells(self, cells, matrix):
+        # re-read the given cells and rebuild only the clusters around them
+        touched = set()
+        for row, col in cells:
+            walkable = bool(matrix[row][col] == 1)
+            if self.grid[row][col] != walkable:
+                self.grid[row][col] = walkable
+                touched.add(self.cluster((row, col)))
+        if not touched:
+            return
+        self.sight = LineOfSight(matrix)
+
+        # a neighbour's inside is unchanged, so its distances only go stale when
+        # its own set of entrances moved
+        stale = set(touched)
+        for cluster in touched:
+            for other in self.neighbour_clusters(cluster):
+                self.build_border(*sorted((cluster, other)))
+                stale.add(other)
+        for cluster in stale:
+            entrances = self.entrances[cluster]
+            self.collect_entrances(cluster)
+            if cluster in touched or self.entrances[cluster] != entrances:
+                self.intra.pop(cluster, None)
+                if not self.lazy:
+                    self.build_intra(cluster)
+
+    # SEARCH
+    def local_search(self, source, bounds, target=None):
+        # Dijkstra that never leaves the given rectangle, or A* when there is a target
+        top, left, bottom, right = bounds
+        grid = self.grid
+        dist = {source: 0.0}
+        parent = {source: None}
+        heap = [(0.0, source)]
+        done = set()
+        while heap:
+            cell = heapq.heappop(heap)[1]
+            if cell in done:
+                continue
+            done.add(cell)
+            if cell == target:
+                break
+            row, col = cell
+            d = dist[cell]
+            for d_row, d_col, step in NEIGHBOURS:
+                n_row = row + d_row
+                n_col = col + d_col
+                if top <= n_row <= bottom and left <= n_col <= right and grid[n_row][n_col]:
+                    neighbour = (n_row, n_col)
+                    if d + step < dist.get(neighbour, math.inf):
+                        dist[neighbour] = d + step
+                        parent[neighbour] = cell
+                        f = d + step
+                        if target is not None:
+                            f += octile(abs(n_row - target[0]), abs(n_col - target[1]))
+                        heapq.heappush(heap, (f, neighbour))
+        return dist, parent
+
+    def local_path(self, source, target, bounds):
+        _, parent = self.local_search(source, bounds, target)
+        path = []
+        cell = target
+        while cell is not None:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+    def create_path(self, start, end):
+        self.cost = None
+        self.expanded = 0
+        start = tuple(start)
+        end = tuple(end)
+        if not self.grid[start[0]][start[1]] or not self.grid[end[0]][end[1]]:
+            return None
+
+        start_cluster = self.cluster(start)
+        end_cluster = self.cluster(end)
+        start_dist, _ = self.local_search(start, self.bounds(start_cluster))
+        end_dist, _ = self.local_search(end, self.bounds(end_cluster))
+        start_edges = {cell: start_dist[cell] for cell in self.entrances[start_cluster]
+                       if cell in start_dist and cell != start}
+        end_edges = {cell: end_dist[cell] for cell in self.entrances[end_cluster]
+                     if cell in end_dist and cell != end}
+
+        # when the clusters touch, a search over just those clusters is cheap and
+        # avoids the detours through entrances that short queries would otherwise take
+        best = math.inf
+        route = None
+        window = None
+        if abs(start_cluster[0] - end_cluster[0]) <= 1 and abs(start_cluster[1] - end_cluster[1]) <= 1:
+            window = self.window(start_cluster, end_cluster)
+            direct, _ = self.local_search(start, window, end)
+            if end in direct:
+                best = direct[end]
+                route = [start, end]
+
+        # A* over the entrances, with the start and end wired in for this query
+        g_score = {start: 0.0}
+        parent = {start: None}
+        heap = [(octile(abs(start[0] - end[0]), abs(start[1] - end[1])), start)]
+        closed = set()
+        while heap:
+            f, node = heapq.heappop(heap)
+            if f >= best:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+            self.expanded += 1
+            if node == end:
+                best = g_score[end]
+                route = []
+                while node is not None:
+                    route.append(node)
+                    node = parent[node]
+                route.reverse()
+                break
+
+            if node == start:
+                edges = list(start_edges.items())
+                edges.extend(self.crossings.get(node, {}).items())
+            else:
+                edges = list(self.intra_edges(self.cluster(node)).get(node, {}).items())
+                edges.extend(self.crossings.get(node, {}).items())
+                if node in end_edges:
+                    edges.append((end, end_edges[node]))
+            for neighbour, cost in edges:
+                g = g_score[node] + cost
+                if g < g_score.get(neighbour, math.inf):
+                    g_score[neighbour] = g
+                    parent[neighbour] = node
+                    h = octile(abs(neighbour[0] - end[0]), abs(neighbour[1] - end[1]))
+                    heapq.heappush(heap, (g + h, neighbour))
+
+        if route is None:
+            return None
+
+        # refine: crossings are single steps, everything else stays inside one cluster
+        if route == [start, end] and window is not None:
+            path = self.local_path(start, end, window)
+        else:
+            path = [route[0]]
+            for source, target in zip(route, route[1:]):
+                if target in self.crossings.get(source, {}):
+                    path.append(target)
+                else:
+                    path.extend(self.local_path(source, target, self.bounds(self.cluster(source)))[1:])
+            # every straight line costs its octile distance, which no cell path
+            # between its ends beats, so this never makes the path longer
+            path = expand_path(self.sight.smooth(path))
+        self.cost = sum(math.hypot(a[0] - b[0], a[1] - b[1]) for a, b in zip(path, path[1:]))
+        return path
@@ -0,0 +1,176 @@
+import heapq
+import math
+
+import numpy as np
+
+from heuristics import octile
+
+SQRT2 = math.sqrt(2)
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+
+class JumpPointSolver:
+    # Jump Point Search with the same move rules as the other solvers: diagonal
+    # moves are always allowed, also past and between walls
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.cost = None
+        self.expanded = 0
+
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        # pad with a ring of walls so that stepping off the map needs no bounds checks
+        self.width = self.cols + 2
+        padded = np.zeros((self.rows + 2, self.width), dtype=bool)
+        padded[1:-1, 1:-1] = np.asarray(matrix) == 1
+        self.walkable = padded.ravel().tolist()
+
+    def index(self, cell):
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def cell(self, index):
+        row, col = divmod(index, self.width)
+        return (row - 1, col - 1)
+
+    def jump_straight(self, node, d_row, d_col):
+        walkable = self.walkable
+        goal = self.goal
+        width = self.width
+        step = d_row * width + d_col
+        while walkable[node]:
+            if node == goal:
+                return node
+            if d_row == 0:
+                if ((walkable[node + d_col + width] and not walkable[node + width]) or
+                        (walkable[node + d_col - width] and not walkable[node - width])):
+                    return node
+            else:
+                if ((walkable[node + step + 1] and not walkable[node + 1]) or
+                        (walkable[node + step - 1] and not walkable[node - 1])):
+                    return node
+            node += step
+        return -1
+
+    def jump(self, node, d_row, d_col):
+        if d_row == 0 or d_col == 0:
+            return self.jump_straight(node, d_row, d_col)
+
+        walkable = self.walkable
+        goal = self.goal
+        vertical = d_row * self.width
+        step = vertical + d_col
+        while walkable[node]:
+            if node == goal:
+                return node
+            if ((walkable[node - d_col + vertical] and not walkable[node - d_col]) or
+                    (walkable[node + d_col - vertical] and not walkable[node - vertical])):
+                return node
+            if (self.jump_straight(node + d_col, 0, d_col) != -1 or
+                    self.jump_straight(node + vertical, d_row, 0) != -1):
+                return node
+            node += step
+        return -1
+
+    def directions(self, node, parent):
+        if parent == -1:
+            return DIRECTIONS
+
+        walkable = self.walkable
+        width = self.width
+        p_row, p_col = divmod(parent, width)
+        n_row, n_col = divmod(node, width)
+        d_row = (n_row > p_row) - (n_row < p_row)
+        d_col = (n_col > p_col) - (n_col < p_col)
+
+        directions = []
+        if d_row and d_col:
+            if walkable[node + d_row * width]:
+                directions.append((d_row, 0))
+            if walkable[node + d_col]:
+                directions.append((0, d_col))
+            directions.append((d_row, d_col))
+            if not walkable[node - d_col]:
+                directions.append((d_row, -d_col))
+            if not walkable[node - d_row * width]:
+                directions.append((-d_row, d_col))
+        elif d_row:
+            directions.append((d_row, 0))
+            if not walkable[node + 1]:
+                directions.append((d_row, 1))
+            if not walkable[node - 1]:
+                directions.append((d_row, -1))
+        else:
+            directions.append((0, d_col))
+            if not walkable[node + width]:
+                directions.append((1, d_col))
+            if not walkable[node - width]:
+                directions.append((-1, d_col))
+        return directions
+
+    def distance(self, a, b):
+        a_row, a_col = divmod(a, self.width)
+        b_row, b_col = divmod(b, self.width)
+        d_row = abs(a_row - b_row)
+        d_col = abs(a_col - b_col)
+        return max(d_row, d_col) + (SQRT2 - 1) * min(d_row, d_col)
+
+    def create_path(self, start, end):
+        self.cost = None
+        self.expanded = 0
+        width = self.width
+        start_index = self.index(start)
+        self.goal = goal = self.index(end)
+        end_row, end_col = divmod(goal, width)
+
+        g_score = {start_index: 0.0}
+        parent = {start_index: -1}
+        closed = set()
+        counter = 0
+        # ranked like Solver: octile f, ties to the node closer to the end
+        open_heap = [(0.0, 0.0, counter, start_index)]
+
+        while open_heap:
+            current = heapq.heappop(open_heap)[3]
+            if current in closed:
+                continue
+            closed.add(current)
+            self.expanded += 1
+
+            if current == goal:
+                self.cost = g_score[current]
+                return self.unfold(current, parent)
+
+            current_g = g_score[current]
+            for d_row, d_col in self.directions(current, parent[current]):
+                jump_point = self.jump(current + d_row * width + d_col, d_row, d_col)
+                if jump_point == -1 or jump_point in closed:
+                    continue
+
+                g = current_g + self.distance(current, jump_point)
+                if g < g_score.get(jump_point, math.inf):
+                    g_score[jump_point] = g
+                    parent[jump_point] = current
+                    row, col = divmod(jump_point, width)
+                    counter += 1
+                    h = octile(abs(row - end_row), abs(col - end_col))
+                    heapq.heappush(open_heap, (round(g + h, 9), h, counter, jump_point))
+
+    def unfold(self, node, parent):
+        # jump points are joined by straight or diagonal runs, fill in the cells between
+        jump_points = []
+        while node != -1:
+            jump_points.append(self.cell(node))
+            node = parent[node]
+        jump_points.reverse()
+
+        path = [jump_points[0]]
+        for row, col in jump_points[1:]:
+            p_row, p_col = path[-1]
+            d_row = (row > p_row) - (row < p_row)
+            d_col = (col > p_col) - (col < p_col)
+            while (p_row, p_col) != (row, col):
+                p_row += d_row
+                p_col += d_col
+                path.append((p_row, p_col))
+        return path
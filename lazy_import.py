@@ -0,0 +1,16 @@
+import importlib
+
+
+class LazyModule:
+    # stands in for a module until the first attribute is looked up, so that
+    # importing GUI code does not load pygame and SDL for headless use
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def __getattr__(self, attr):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return getattr(module, attr)
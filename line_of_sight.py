@@ -0,0 +1,102 @@
+import numpy as np
+
+# candidate waypoints checked per vectorized batch while smoothing
+SMOOTH_BATCH = 32
+# lines up to this many steps are faster to walk in plain Python than with numpy
+SHORT_LINE = 24
+
+
+def line_cells(start, end):
+    # Bresenham cells from start to end as (rows, cols) arrays; consecutive
+    # cells are 8-neighbours, so a line of walkable cells is a valid cell path
+    # under the solvers' move rules, corner cutting included
+    (row, col), (end_row, end_col) = start, end
+    d_row = end_row - row
+    d_col = end_col - col
+    steps = max(abs(d_row), abs(d_col), 1)
+    t = np.arange(steps + 1)
+    return row + (2 * t * d_row + steps) // (2 * steps), col + (2 * t * d_col + steps) // (2 * steps)
+
+
+class LineOfSight:
+    # line-of-sight tests on a matrix; many lines from one cell are checked in
+    # a single vectorized pass
+    def __init__(self, matrix):
+        self.walkable = np.asarray(matrix) == 1
+        # flat bytes for the short lines walked one cell at a time
+        self.flat = self.walkable.view(np.uint8).tobytes()
+        self.cols = self.walkable.shape[1]
+
+    def visible(self, start, end):
+        (row, col), (end_row, end_col) = start, end
+        d_row = end_row - row
+        d_col = end_col - col
+        steps = max(abs(d_row), abs(d_col), 1)
+        if steps > SHORT_LINE:
+            rows, cols = line_cells(start, end)
+            return bool(self.walkable[rows, cols].all())
+        # the same cells as line_cells
+        flat = self.flat
+        cols = self.cols
+        double = 2 * steps
+        for t in range(steps + 1):
+            if not flat[(row + (2 * t * d_row + steps) // double) * cols
+                        + col + (2 * t * d_col + steps) // double]:
+                return False
+        return True
+
+    def visible_from(self, start, ends):
+        # for each of ends, whether the line from start to it is clear
+        ends = np.asarray(ends, dtype=np.intp).reshape(-1, 2)
+        if not len(ends):
+            return np.zeros(0, dtype=bool)
+        d_row = ends[:, 0] - start[0]
+        d_col = ends[:, 1] - start[1]
+        steps = np.maximum(np.maximum(np.abs(d_row), np.abs(d_col)), 1)
+
+        # every line's cells laid end to end: line is which line a cell is on
+        # and t how far along it
+        counts = steps + 1
+        line = np.repeat(np.arange(len(ends)), counts)
+        t = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = start[0] + (2 * t * d_row[line] + steps[line]) // (2 * steps[line])
+        cols = start[1] + (2 * t * d_col[line] + steps[line]) // (2 * steps[line])
+        blocked = np.bincount(line, weights=~self.walkable[rows, cols], minlength=len(ends))
+        return blocked == 0
+
+    def smooth(self, path):
+        # string pulling: from each waypoint go straight to the furthest later
+        # cell of the path it can see. The result is never longer than path.
+        if not path or len(path) < 3:
+            return list(path) if path else path
+        waypoints = [path[0]]
+        anchor = 0
+        last = len(path) - 1
+        while anchor < last:
+            # the next cell is always visible, so every round moves on
+            furthest = anchor + 1
+            first = anchor + 1
+            while first <= last:
+                stop = min(first + SMOOTH_BATCH, last + 1)
+                visible = np.flatnonzero(self.visible_from(path[anchor], path[first:stop]))
+                if len(visible):
+                    furthest = first + int(visible[-1])
+                if furthest != stop - 1:
+                    break
+                first = stop
+            anchor = furthest
+            waypoints.append(path[anchor])
+        return waypoints
+
+
+def expand_path(waypoints):
+    # the cells along a waypoint path, for drawing or per-cell steering;
+    # paths of adjacent cells come back unchanged
+    if not waypoints:
+        return waypoints
+    cells = [tuple(waypoints[0])]
+    for start, end in zip(waypoints, waypoints[1:]):
+        rows, cols = line_cells(start, end)
+        cells.extend(zip(rows[1:].tolist(), cols[1:].tolist()))
+    return cells
+
@@ -0,0 +1,150 @@
+import heapq
+import math
+
+import numpy as np
+
+from heuristics import octile
+from solver import NEIGHBOURS
+
+
+class IncrementalPlanner:
+    # Lifelong Planning A*: keeps g/rhs values between calls so that after a few
+    # cells change only the part of the search they affect is repaired
+    def __init__(self, matrix):
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        self.walkable = (np.asarray(matrix) == 1).ravel().tolist()
+
+        self.start = None
+        self.end = None
+        self.cost = None
+        self.expanded = 0
+
+    def reset(self, start, end):
+        size = self.rows * self.cols
+        self.start = start
+        self.end = end
+        self.g = [math.inf] * size
+        self.rhs = [math.inf] * size
+        # key each cell is queued under, None when it is not in the queue
+        self.queued = [None] * size
+        self.heap = []
+
+        self.start_index = self.index(start)
+        self.rhs[self.start_index] = 0.0
+        self.push(self.start_index)
+
+    def index(self, cell):
+        return cell[0] * self.cols + cell[1]
+
+    def heuristic(self, index):
+        row, col = divmod(index, self.cols)
+        # the same octile distance as Solver, exact on open 8-connected grids
+        return octile(abs(row - self.end[0]), abs(col - self.end[1]))
+
+    def key(self, index):
+        # rounded like Solver's f: on a path, g + h of a cell can come out a few
+        # ulps above g of the end, which would leave that cell unrepaired
+        best = min(self.g[index], self.rhs[index])
+        return (round(best + self.heuristic(index), 9), best)
+
+    def push(self, index):
+        key = self.key(index)
+        self.queued[index] = key
+        heapq.heappush(self.heap, (key, index))
+
+    def neighbours(self, index):
+        row, col = divmod(index, self.cols)
+        for d_row, d_col, step in NEIGHBOURS:
+            n_row = row + d_row
+            n_col = col + d_col
+            if 0 <= n_row < self.rows and 0 <= n_col < self.cols:
+                neighbour = n_row * self.cols + n_col
+                if self.walkable[neighbour]:
+                    yield neighbour, step
+
+    def update_vertex(self, index):
+        if index != self.start_index:
+            best = math.inf
+            if self.walkable[index]:
+                g = self.g
+                for neighbour, step in self.neighbours(index):
+                    if g[neighbour] + step < best:
+                        best = g[neighbour] + step
+            self.rhs[index] = best
+
+        self.queued[index] = None
+        if self.g[index] != self.rhs[index]:
+            self.push(index)
+
+    def top_key(self):
+        heap = self.heap
+        queued = self.queued
+        while heap and queued[heap[0][1]] != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else (math.inf, math.inf)
+
+    def compute_shortest_path(self):
+        end_index = self.index(self.end)
+        g = self.g
+        rhs = self.rhs
+        while self.top_key() < self.key(end_index) or rhs[end_index] != g[end_index]:
+            _, index = heapq.heappop(self.heap)
+            self.queued[index] = None
+            self.expanded += 1
+
+            if g[index] > rhs[index]:
+                g[index] = rhs[index]
+                for neighbour, _ in self.neighbours(index):
+                    self.update_vertex(neighbour)
+            else:
+                g[index] = math.inf
+                self.update_vertex(index)
+                for neighbour, _ in self.neighbours(index):
+                    self.update_vertex(neighbour)
+
+    def update_cells(self, cells, matrix):
+        # re-read the given cells from matrix and repair the search around them
+        changed = []
+        for row, col in cells:
+            index = row * self.cols + col
+            walkable = bool(matrix[row][col] == 1)
+            if self.walkable[index] != walkable:
+                self.walkable[index] = walkable
+                changed.append(index)
+
+        if self.start is None:
+            return
+        for index in changed:
+            self.update_vertex(index)
+            row, col = divmod(index, self.cols)
+            for d_row, d_col, _ in NEIGHBOURS:
+                n_row = row + d_row
+                n_col = col + d_col
+                if 0 <= n_row < self.rows and 0 <= n_col < self.cols:
+                    self.update_vertex(n_row * self.cols + n_col)
+
+    def create_path(self, start, end):
+        if (start, end) != (self.start, self.end):
+            self.reset(start, end)
+        self.expanded = 0
+        self.compute_shortest_path()
+
+        end_index = self.index(end)
+        self.cost = None
+        if self.g[end_index] == math.inf:
+            return None
+        self.cost = self.g[end_index]
+
+        # walk back from the end along the predecessors that explain each g value
+        g = self.g
+        path = [end_index]
+        current = end_index
+        while current != self.start_index:
+            previous = min(self.neighbours(current), key=lambda item: g[item[0]] + item[1])[0]
+            if not g[previous] < g[current]:
+                raise RuntimeError(f'LPA* left an inconsistent g at {divmod(current, self.cols)}')
+            current = previous
+            path.append(current)
+        path.reverse()
+        return [divmod(index, self.cols) for index in path]
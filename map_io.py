@@ -0,0 +1,180 @@
+import os
+import struct
+
+import numpy as np
+
+# compact format: a 64 byte header followed by the cells row by row, either one
+# byte per cell (1 free, 0 blocked, or terrain weights when saved weighted, which
+# the header flags) or bit-packed with each row padded to whole bytes. Both are
+# opened with np.memmap, so nothing is parsed or read up front.
+MAGIC = b'GRIDMAP\0'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sBBBxxxxxQQ')
+HEADER_SIZE = 64
+UINT8 = 0
+BITS = 1
+# header flags; files written before there were flags have none set
+WEIGHTED = 1
+
+# rows written per block when saving, so big maps never need a second full copy
+BLOCK_BYTES = 1 << 24
+
+# Moving AI .map terrain: ground, grass and swamp are passable, the rest
+# (trees, water, out of bounds) is not
+MOVINGAI_FREE = b'.GS'
+
+
+class PackedMap:
+    # read-only bit-packed map. Rows unpack on demand, so matrix[row][col] and
+    # windows of a huge map cost only what they touch; np.asarray unpacks it all.
+    def __init__(self, bits, rows, cols):
+        self.bits = bits
+        self.rows = rows
+        self.cols = cols
+        self.shape = (rows, cols)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            top, bottom, _ = row.indices(self.rows)
+            return self.window(top, 0, bottom, self.cols)
+        return np.unpackbits(self.bits[row], count=self.cols)
+
+    def window(self, top, left, bottom, right):
+        # cells [top, bottom) x [left, right) as a uint8 array
+        first = left // 8
+        last = -(-right // 8)
+        unpacked = np.unpackbits(self.bits[top:bottom, first:last], axis=1)
+        return unpacked[:, left - 8 * first:right - 8 * first]
+
+    def __array__(self, dtype=None, copy=None):
+        unpacked = self.window(0, 0, self.rows, self.cols)
+        return unpacked if dtype is None else unpacked.astype(dtype)
+
+
+def save_map(path, matrix, packed=False, weighted=False):
+    # weighted keeps cell values as terrain weights, 0 blocked
+    if packed and weighted:
+        raise ValueError('terrain weights need one byte per cell')
+    rows, cols = len(matrix), len(matrix[0])
+    encoding = BITS if packed else UINT8
+    flags = WEIGHTED if weighted else 0
+    row_bytes = -(-cols // 8) if packed else cols
+    block = max(1, BLOCK_BYTES // max(row_bytes, 1))
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, encoding, flags, rows, cols).ljust(HEADER_SIZE, b'\0'))
+        for top in range(0, rows, block):
+            block_cells = np.asarray(matrix[top:top + block])
+            if weighted:
+                data = block_cells.astype(np.uint8)
+            else:
+                walkable = block_cells == 1
+                data = np.packbits(walkable, axis=1) if packed else walkable.view(np.uint8)
+            file.write(np.ascontiguousarray(data).tobytes())
+
+
+def read_header(path):
+    with open(path, 'rb') as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f'{path}: not a grid map file')
+    magic, version, encoding, flags, rows, cols = HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ValueError(f'{path}: not a grid map file')
+    if version != FORMAT_VERSION or encoding not in (UINT8, BITS):
+        raise ValueError(f'{path}: unsupported grid map version {version}, encoding {encoding}')
+    return encoding, flags, rows, cols
+
+
+def open_map(path, mode='r'):
+    # a (rows, cols) uint8 memmap, or a PackedMap for bit-packed files;
+    # mode='r+' maps uint8 files writable, so edits go straight to disk
+    encoding, _, rows, cols = read_header(path)
+    if encoding == BITS:
+        bits = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE, shape=(rows, -(-cols // 8)))
+        return PackedMap(bits, rows, cols)
+    return np.memmap(path, dtype=np.uint8, mode=mode, offset=HEADER_SIZE, shape=(rows, cols))
+
+
+def create_map(path, rows, cols):
+    # an all-free uint8 map of any size, mapped writable without allocating it in RAM
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, UINT8, 0, rows, cols).ljust(HEADER_SIZE, b'\0'))
+        file.truncate(HEADER_SIZE + rows * cols)
+    matrix = open_map(path, 'r+')
+    matrix[:] = 1
+    return matrix
+
+
+# MOVING AI
+def read_movingai(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    header = {}
+    offset = 0
+    while True:
+        end = data.index(b'\n', offset)
+        line = data[offset:end].strip()
+        offset = end + 1
+        if line == b'map':
+            break
+        key, _, value = line.partition(b' ')
+        header[key.decode()] = value.decode()
+    rows = int(header['height'])
+    cols = int(header['width'])
+
+    # every row is cols characters and a line ending of one or two bytes; the
+    # last one may be missing
+    newline = data.find(b'\n', offset)
+    stride = newline - offset + 1 if newline != -1 else cols + 1
+    body = np.frombuffer(data, dtype=np.uint8, offset=offset)[:rows * stride]
+    body = np.pad(body, (0, rows * stride - body.size)).reshape(rows, stride)[:, :cols]
+    return np.isin(body, np.frombuffer(MOVINGAI_FREE, dtype=np.uint8)).astype(np.uint8)
+
+
+def write_movingai(path, matrix):
+    walkable = np.asarray(matrix) == 1
+    rows, cols = walkable.shape
+    body = np.where(walkable, ord('.'), ord('@')).astype(np.uint8)
+    body = np.hstack([body, np.full((rows, 1), ord('\n'), dtype=np.uint8)])
+    with open(path, 'wb') as file:
+        file.write(f'type octile\nheight {rows}\nwidth {cols}\nmap\n'.encode())
+        file.write(body.tobytes())
+
+
+def read_scenarios(path):
+    # Moving AI .scen queries as ((row, col) start, (row, col) end, optimal length).
+    # Those lengths forbid cutting corners, so ours can be shorter.
+    queries = []
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) < 9 or fields[0] == 'version':
+                continue
+            start_x, start_y, end_x, end_y = map(int, fields[4:8])
+            queries.append(((start_y, start_x), (end_y, end_x), float(fields[8])))
+    return queries
+
+
+def load_map(path):
+    # by extension: Moving AI text for .map, the compact memory-mapped format otherwise
+    if os.path.splitext(path)[1] == '.map':
+        return read_movingai(path)
+    return open_map(path)
+
+
+def map_weighted(path):
+    # whether load_map gives terrain weights (0 blocked) rather than 1 free, 0 blocked
+    if os.path.splitext(path)[1] == '.map':
+        return False
+    return bool(read_header(path)[1] & WEIGHTED)
+
+
+def store_map(path, matrix, packed=False, weighted=False):
+    if os.path.splitext(path)[1] == '.map':
+        # Moving AI maps have no weights, only passable terrain
+        write_movingai(path, np.asarray(matrix) > 0 if weighted else matrix)
+    else:
+        save_map(path, matrix, packed, weighted)
@@ -0,0 +1,191 @@
+import heapq
+import math
+from collections import defaultdict
+
+from distance_field import FieldCache
+from solver import Solver
+
+# moves of the space-time search: the eight steps and waiting in place
+WAIT = (0, 0, 0, 1.0)
+
+
+class ReservationTable:
+    # cells and moves claimed by the agents planned so far, over time steps.
+    # Cells are flat indices of the padded grid, as in DistanceField.
+    def __init__(self):
+        self.cells = set()
+        # (from, to, t) for a move from t to t + 1
+        self.moves = set()
+        # cell -> time from which an agent stays there for good
+        self.parked = {}
+        # cell -> last time anyone is there
+        self.last = {}
+
+    def free(self, cell, t):
+        if (cell, t) in self.cells:
+            return False
+        parked = self.parked.get(cell)
+        return parked is None or t < parked
+
+    def crossing(self, cell, next_cell, t):
+        # another agent moving the other way along the same edge at the same time
+        return (next_cell, cell, t) in self.moves
+
+    def can_park(self, cell, t):
+        return self.last.get(cell, -1) < t and cell not in self.parked
+
+    def reserve(self, cells, park):
+        for t, cell in enumerate(cells):
+            self.cells.add((cell, t))
+            if t:
+                self.moves.add((cells[t - 1], cell, t - 1))
+        for cell in cells:
+            self.last[cell] = max(self.last.get(cell, -1), len(cells) - 1)
+        if park:
+            self.parked[cells[-1]] = len(cells) - 1
+
+
+class MultiAgentPlanner:
+    # routes many agents over one map. Agents are grouped by destination and
+    # every group shares one reverse search, a distance field flooded from the
+    # destination, which then gives each agent its path at O(path length).
+    # Fields are kept between calls while the map is unchanged, so ticks that
+    # reuse destinations flood nothing. Lone agents with no cached field get
+    # a plain A* instead, which is cheaper than a flood.
+    #
+    # With cooperative set, agents are planned one after the other in the
+    # order given (cooperative A*): each searches over (cell, time) with
+    # waiting as a move, around the cells and edges that earlier agents
+    # reserved, with its destination's field as an exact heuristic. Paths then
+    # list one cell per time step, waits included.
+    def __init__(self, matrix, cooperative=False, min_group=2, max_delay=32, maxsize=64):
+        self.cooperative = cooperative
+        self.min_group = min_group
+        # time steps an agent may lose to waiting and detours before it gives up
+        self.max_delay = max_delay
+        self.fields = FieldCache(maxsize)
+        # field distances as flat lists by destination, for the space-time
+        # search, which reads them one at a time
+        self.heuristics = {}
+        self.version = 0
+        self.update_map(matrix)
+
+        self.searches = 0
+        self.expanded = 0
+
+    def update_map(self, matrix):
+        # fields of the old map are dropped on the next plan
+        self.matrix = matrix
+        self.solver = None
+        self.heuristics.clear()
+        self.version += 1
+
+    def plan(self, agents):
+        # agents are (start, end) pairs; returns their paths in the same order,
+        # None for agents that cannot reach their end
+        agents = [(tuple(start), tuple(end)) for start, end in agents]
+        groups = defaultdict(list)
+        for agent, (start, end) in enumerate(agents):
+            groups[end].append(agent)
+
+        if self.cooperative:
+            return self.plan_cooperative(agents, groups)
+
+        paths = [None] * len(agents)
+        for end, members in groups.items():
+            field = self.fields.lookup(self.version, [end])
+            if field is None and len(members) < self.min_group:
+                for agent in members:
+                    paths[agent] = self.search(*agents[agent])
+                continue
+            if field is None:
+                field = self.fields.get(self.version, self.matrix, [end])
+            for agent in members:
+                paths[agent] = field.path_from(agents[agent][0])
+        return paths
+
+    def search(self, start, end):
+        if self.solver is None:
+            self.solver = Solver(self.matrix)
+        self.searches += 1
+        path = self.solver.create_path(start, end)
+        self.expanded += self.solver.expanded
+        return path
+
+    # COOPERATIVE
+    def plan_cooperative(self, agents, groups):
+        table = ReservationTable()
+        paths = []
+        for start, end in agents:
+            field = self.fields.get(self.version, self.matrix, [end])
+            # agents sharing a destination leave the board on arrival, the
+            # others stay on their destination
+            park = len(groups[end]) == 1
+            if end not in self.heuristics:
+                self.heuristics[end] = field.padded_distances.ravel().tolist()
+            cells = self.space_time_search(field, self.heuristics[end], start, end, table, park)
+            if cells is None:
+                # stuck agents stay where they are
+                cells = [self.flat(field, start)]
+                table.reserve(cells, park=True)
+                paths.append(None)
+                continue
+            table.reserve(cells, park)
+            paths.append([self.cell(field, index) for index in cells])
+        return paths
+
+    def flat(self, field, cell):
+        return (cell[0] + 1) * field.width + cell[1] + 1
+
+    def cell(self, field, index):
+        row, col = divmod(index, field.width)
+        return (row - 1, col - 1)
+
+    def space_time_search(self, field, distances, start, end, table, park):
+        # A* over (cell, time); returns the flat cell at every time step
+        start_index = self.flat(field, start)
+        end_index = self.flat(field, end)
+        if distances[start_index] == math.inf or not table.free(start_index, 0):
+            return None
+        moves = [(delta, step) for delta, _, _, step in field.offsets] + [(WAIT[0], WAIT[3])]
+        # no agent needs more steps than its own path has moves, plus the delay
+        max_time = len(field.path_from(start)) - 1 + self.max_delay
+
+        self.searches += 1
+        counter = 0
+        h = distances[start_index]
+        open_heap = [(h, h, counter, start_index, 0)]
+        g_score = {(start_index, 0): 0.0}
+        parent = {}
+        closed = set()
+        while open_heap:
+            _, _, _, index, t = heapq.heappop(open_heap)
+            state = (index, t)
+            if state in closed:
+                continue
+            closed.add(state)
+            self.expanded += 1
+            if index == end_index and (not park or table.can_park(index, t)):
+                cells = []
+                while state is not None:
+                    cells.append(state[0])
+                    state = parent.get(state)
+                cells.reverse()
+                return cells
+            if t >= max_time:
+                continue
+
+            g = g_score[state]
+            for delta, step in moves:
+                next_index = index + delta
+                h = distances[next_index]
+                if h == math.inf or not table.free(next_index, t + 1) or table.crossing(index, next_index, t):
+                    continue
+                next_state = (next_index, t + 1)
+                next_g = g + step
+                if next_g < g_score.get(next_state, math.inf):
+                    g_score[next_state] = next_g
+                    parent[next_state] = state
+                    counter += 1
+                    heapq.heappush(open_heap, (round(next_g + h, 9), h, counter, next_index, t + 1))
+        return None
@@ -0,0 +1,67 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+def map_key(matrix):
+    # content hash for callers that do not track a map version
+    walkable = np.ascontiguousarray(np.asarray(matrix) == 1)
+    digest = hashlib.blake2b(walkable.tobytes(), digest_size=16)
+    digest.update(repr(walkable.shape).encode())
+    return digest.hexdigest()
+
+
+class PathCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.version = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def sync(self, version):
+        # entries of an older map can never be hit again, so drop them at once
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+    def get(self, version, start, end):
+        self.sync(version)
+        key = (start, end)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, version, start, end, path):
+        self.sync(version)
+        key = (start, end)
+        # an empty list records that there is no path
+        self.entries[key] = list(path) if path else []
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self):
+        self.entries.clear()
+        self.version = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+        }
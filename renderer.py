@@ -0,0 +1,173 @@
+import time
+
+import numpy as np
+
+from cell_grid import COLORS
+from lazy_import import LazyModule
+
+pygame = LazyModule('pygame')
+
+BACKGROUND_COLOR = (0, 200, 150)
+GRID_COLOR = (0, 0, 0)
+GRID_KEY = (255, 0, 255)
+STATS_COLOR = (0, 0, 0)
+
+# above this many changed cells one vectorized board blit beats per-cell rects
+MAX_DIRTY_CELLS = 256
+# cells smaller than this many pixels are drawn without grid lines
+GRID_MIN_SIZE = 6
+
+
+class Renderer:
+    # draws the cells inside the game's viewport only, so a frame costs about
+    # the same for any board size
+    def __init__(self, game, viewport, menu_width):
+        self.game = game
+        self.viewport = viewport
+        self.menu_width = menu_width
+
+        self.buttons = None
+        self.buttons_state = None
+        self.font = None
+        self.grid = None
+        self.grid_key = None
+
+        # the sampled window of cell states as it is on screen, and the view it
+        # was drawn for
+        self.shown = None
+        self.shown_view = None
+        self.full_redraw = True
+
+        self.frame_time = 0.0
+        self.stats_rect = None
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    @property
+    def board_rect(self):
+        return pygame.Rect(self.menu_width, 0, self.viewport.width, self.viewport.height)
+
+    def cell_rect(self, row, col, window):
+        # screen rect of one sampled cell of the window, inside its grid lines
+        top, left, _, _, step = window
+        size = self.viewport.size * step
+        x, y = self.viewport.origin(top, left)
+        border = 1 if size >= GRID_MIN_SIZE else 0
+        return pygame.Rect(self.menu_width + x + col * size + border, y + row * size + border,
+                           size - 2 * border, size - 2 * border)
+
+    # LAYERS
+    def build_buttons(self, state):
+        game = self.game
+        self.buttons = pygame.Surface((self.menu_width, game.HEIGHT))
+        self.buttons.fill(BACKGROUND_COLOR)
+        game.draw_buttons(self.buttons)
+        self.buttons_state = state
+
+    def build_grid(self, size, cell_size):
+        # black cell borders over a transparent background, laid over the scaled board
+        self.grid = pygame.Surface(size)
+        self.grid.fill(GRID_KEY)
+        self.grid.set_colorkey(GRID_KEY)
+        for x in range(0, size[0], cell_size):
+            pygame.draw.rect(self.grid, GRID_COLOR, (x, 0, cell_size, size[1]), 1)
+        for y in range(0, size[1], cell_size):
+            pygame.draw.rect(self.grid, GRID_COLOR, (0, y, size[0], cell_size), 1)
+        self.grid_key = (size, cell_size)
+
+    def board_surface(self, sample, cell_size):
+        # one pixel per sampled cell, scaled up to cell size
+        size = (sample.shape[1] * cell_size, sample.shape[0] * cell_size)
+        # an 8-bit surface with the state colors as its palette, so no RGB copy
+        pixels = pygame.surfarray.make_surface(sample.T)
+        pixels.set_palette([tuple(color) for color in COLORS.tolist()])
+        if cell_size == 1:
+            return pixels
+        # zoomed in there are few cells, and scaling and the grid blit are
+        # faster in the display format
+        board = pygame.transform.scale(pixels.convert(), size)
+        if cell_size >= GRID_MIN_SIZE:
+            if self.grid_key != (size, cell_size):
+                self.build_grid(size, cell_size)
+            board.blit(self.grid, (0, 0))
+        return board
+
+    def draw_board(self, win, sample, window):
+        top, left, _, _, step = window
+        rect = self.board_rect
+        win.set_clip(rect)
+        win.fill(BACKGROUND_COLOR, rect)
+        x, y = self.viewport.origin(top, left)
+        win.blit(self.board_surface(sample, int(self.viewport.size * step)), (rect.x + x, rect.y + y))
+        win.set_clip(None)
+        return rect
+
+    # FRAME
+    def draw(self, win, fps=0.0):
+        started = time.perf_counter()
+        game = self.game
+        viewport = self.viewport
+        window = viewport.window()
+        top, left, bottom, right, step = window
+        # zoomed out, every step-th cell stands for its block: a strided view
+        # the size of the screen, whatever the size of the board
+        sample = game.cells.picture(slice(top, bottom, step), slice(left, right, step))
+        view = (viewport.state(), window)
+        rects = []
+
+        state = game.buttons_state()
+        if state != self.buttons_state:
+            self.build_buttons(state)
+            rects.append(win.blit(self.buttons, (0, 0)))
+
+        if self.full_redraw:
+            win.blit(self.buttons, (0, 0))
+            self.draw_board(win, sample, window)
+            rects = [win.get_rect()]
+            self.full_redraw = False
+        elif view != self.shown_view:
+            rects.append(self.draw_board(win, sample, window))
+        else:
+            rows, cols = np.nonzero(sample != self.shown)
+            if len(rows) > MAX_DIRTY_CELLS:
+                rects.append(self.draw_board(win, sample, window))
+            else:
+                colors = COLORS[sample[rows, cols]].tolist()
+                board = self.board_rect
+                win.set_clip(board)
+                for row, col, color in zip(rows.tolist(), cols.tolist(), colors):
+                    rects.append(pygame.draw.rect(win, color, self.cell_rect(row, col, window)).clip(board))
+                win.set_clip(None)
+        self.shown = sample.copy()
+        self.shown_view = view
+
+        rects.append(self.draw_stats(win, fps))
+        self.frame_time = 0.9 * self.frame_time + 0.1 * (time.perf_counter() - started)
+        return rects
+
+    def draw_stats(self, win, fps):
+        if self.font is None:
+            self.font = pygame.font.SysFont('comicsans', 16)
+
+        text = self.font.render(
+            f'FPS {fps:5.1f}  frame {self.frame_time * 1000:5.2f} ms', True, STATS_COLOR)
+        rect = text.get_rect(bottomleft=(5, self.game.HEIGHT - 2))
+        # search progress or stats on lines of their own above the timings
+        lines = []
+        bottom = rect.top
+        for line in reversed(self.game.status_text().splitlines()):
+            line = self.font.render(line, True, STATS_COLOR)
+            line_rect = line.get_rect(bottomleft=(5, bottom))
+            lines.append((line, line_rect))
+            rect = rect.union(line_rect)
+            bottom = line_rect.top
+
+        # clear the previous reading from the menu layer before drawing the new one
+        dirty = rect.union(self.stats_rect) if self.stats_rect else rect
+        win.blit(self.buttons, dirty, dirty)
+        win.blit(text, text.get_rect(bottomleft=(5, self.game.HEIGHT - 2)))
+        for line, line_rect in lines:
+            win.blit(line, line_rect)
+        self.stats_rect = rect
+        return dirty
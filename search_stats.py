@@ -0,0 +1,96 @@
+import time
+
+# phases of a search, in the order they run; smooth is only spent by backends
+# that smooth their paths
+PHASES = ('setup', 'search', 'path', 'smooth')
+
+
+class SearchStats:
+    # what one search did: expanded cells, generated heap entries, of which
+    # decreased were cells already on the open list reached with a lower g
+    # (closed cells are never decreased), stale heap entries skipped when
+    # popped, the largest the open list got, heuristic evaluations, and
+    # seconds spent in each phase
+    def __init__(self, expanded=0, generated=0, decreased=0, stale=0, peak_open=0,
+                 heuristic_calls=0, times=None):
+        self.expanded = expanded
+        self.generated = generated
+        self.decreased = decreased
+        self.stale = stale
+        self.peak_open = peak_open
+        self.heuristic_calls = heuristic_calls
+        self.times = dict.fromkeys(PHASES, 0.0) if times is None else times
+
+    @property
+    def elapsed(self):
+        return sum(self.times.values())
+
+    def as_dict(self):
+        return {
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'decreased': self.decreased,
+            'stale': self.stale,
+            'peak_open': self.peak_open,
+            'heuristic_calls': self.heuristic_calls,
+            'times': dict(self.times),
+        }
+
+    def __repr__(self):
+        times = ', '.join(f'{phase}={seconds * 1000:.3f}ms' for phase, seconds in self.times.items())
+        return (f'SearchStats(expanded={self.expanded}, generated={self.generated}, '
+                f'decreased={self.decreased}, stale={self.stale}, peak_open={self.peak_open}, '
+                f'heuristic_calls={self.heuristic_calls}, {times})')
+
+
+class LogSink:
+    # a stats sink that logs one line per search, at INFO by default
+    def __init__(self, logger=None, level=None):
+        # logging and the profilers are imported on use, they would add a
+        # good part of the solvers' import time
+        import logging
+
+        self.logger = logger or logging.getLogger('pathfinder.search')
+        self.level = logging.INFO if level is None else level
+
+    def __call__(self, stats):
+        self.logger.log(self.level, '%r', stats)
+
+
+def profile_search(backend, start, end, path, limit=30):
+    # run one query under cProfile and tracemalloc and write a text report to
+    # path; returns the SearchResult. Both slow the search down several times,
+    # so the timings are only good for comparing functions with each other.
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        profiler.enable()
+        result = backend.search(start, end)
+        profiler.disable()
+        wall = time.perf_counter() - started
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    calls = io.StringIO()
+    pstats.Stats(profiler, stream=calls).sort_stats('cumulative').print_stats(limit)
+    with open(path, 'w') as file:
+        file.write(f'backend {backend.name}, {start} -> {end}\n')
+        file.write(f'{result!r}\n')
+        if getattr(result, 'stats', None) is not None:
+            file.write(f'{result.stats!r}\n')
+        file.write(f'wall time under the profiler {wall:.3f}s\n')
+        file.write(f'memory: peak {peak / 2 ** 20:.2f} MiB, still held {current / 2 ** 20:.2f} MiB\n\n')
+        file.write('largest allocations still held:\n')
+        for line in snapshot.statistics('lineno')[:limit // 3]:
+            file.write(f'  {line}\n')
+        file.write('\n')
+        file.write(calls.getvalue())
+    return result
@@ -0,0 +1,140 @@
+import argparse
+import json
+import sys
+import time
+
+from backends import available_backends, backend_matrix, get_backend
+from map_io import load_map, map_weighted, read_scenarios
+
+# headless entry point: python -m solve MAP < queries > paths.jsonl
+#
+# Queries come one per line from --queries or stdin, either as JSON,
+# {"start": [row, col], "end": [row, col]} or [[row, col], [row, col]], or as
+# four numbers "row col row col". Every query gets one JSON line back, in
+# order. pygame is only imported with --gui.
+
+
+def parse_query(line):
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line[0] in '{[':
+        query = json.loads(line)
+        if isinstance(query, dict):
+            query = (query['start'], query['end'])
+        start, end = query
+    else:
+        start_row, start_col, end_row, end_col = map(int, line.split())
+        start, end = (start_row, start_col), (end_row, end_col)
+    for cell in (start, end):
+        if len(cell) != 2:
+            raise ValueError(f'a cell is [row, col], got {cell}')
+    return (int(start[0]), int(start[1])), (int(end[0]), int(end[1]))
+
+
+def check_cell(cell, shape):
+    if not (0 <= cell[0] < shape[0] and 0 <= cell[1] < shape[1]):
+        raise ValueError(f'cell {list(cell)} is off the {shape[0]}x{shape[1]} map')
+
+
+def read_queries(file):
+    # (line number, query, error) for every query line
+    for number, line in enumerate(file, 1):
+        try:
+            query = parse_query(line)
+        except (ValueError, KeyError, TypeError) as error:
+            yield number, None, f'bad query: {error}'
+            continue
+        if query is not None:
+            yield number, query, None
+
+
+def solve(backend, shape, queries, output, stats=False):
+    # writes a JSON line per query; returns the number of failed queries
+    failed = 0
+    for index, (line, query, error) in enumerate(queries):
+        record = {'index': index, 'line': line}
+        if error is None:
+            start, end = query
+            try:
+                check_cell(start, shape)
+                check_cell(end, shape)
+            except ValueError as problem:
+                error = str(problem)
+        if error is not None:
+            failed += 1
+            record['error'] = error
+        else:
+            result = backend.search(start, end)
+            record.update(start=list(start), end=list(end),
+                          path=[list(cell) for cell in result.path] if result.found else None,
+                          cost=result.cost, expanded=result.expanded, elapsed=result.elapsed)
+            if stats and result.stats is not None:
+                record['stats'] = result.stats.as_dict()
+        output.write(json.dumps(record) + '\n')
+    return failed
+
+
+def main(argv=None):
+    started = time.perf_counter()
+    parser = argparse.ArgumentParser(
+        prog='python -m solve',
+        description='Solve path queries on a map file and write the paths as JSON lines.')
+    parser.add_argument('map', nargs='?', help='Moving AI .map or compact map file')
+    parser.add_argument('--backend', default='a_star', choices=available_backends())
+    parser.add_argument('--queries', default='-', help='query file, - for stdin (default)')
+    parser.add_argument('--scenarios', help='Moving AI .scen file to take the queries from instead')
+    parser.add_argument('--output', default='-', help='file for the JSON lines, - for stdout (default)')
+    parser.add_argument('--smooth', action='store_true', help='cut paths down to waypoints')
+    parser.add_argument('--stats', action='store_true', help='add the search stats to every line')
+    parser.add_argument('--timing', action='store_true',
+                        help='print the startup and total time to stderr')
+    parser.add_argument('--gui', action='store_true', help='open the map in the game instead')
+    args = parser.parse_args(argv)
+
+    if args.gui:
+        # the only path that loads pygame
+        from game import Game
+
+        try:
+            game = Game(backend=args.backend, map_path=args.map, smooth=args.smooth)
+        except ValueError as error:
+            parser.error(str(error))
+        game.play()
+        return 0
+    if args.map is None:
+        parser.error('a map file is needed unless --gui is given')
+
+    matrix = load_map(args.map)
+    shape = (len(matrix), len(matrix[0]))
+    try:
+        board = backend_matrix(args.backend, matrix, map_weighted(args.map))
+        backend = get_backend(args.backend, board, smooth=args.smooth)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.scenarios:
+        queries = [(number, (start, end), None)
+                   for number, (start, end, _) in enumerate(read_scenarios(args.scenarios), 1)]
+        query_file = None
+    else:
+        query_file = sys.stdin if args.queries == '-' else open(args.queries)
+        queries = read_queries(query_file)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        ready = time.perf_counter() - started
+        failed = solve(backend, shape, queries, output, args.stats)
+    finally:
+        if query_file not in (None, sys.stdin):
+            query_file.close()
+        if output is not sys.stdout:
+            output.close()
+    if args.timing:
+        # startup counts from main(); the interpreter and imports come before it
+        print(f'ready in {ready * 1000:.1f} ms, done in {(time.perf_counter() - started) * 1000:.1f} ms',
+              file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,248 @@
+import heapq
+import math
+import time
+from array import array
+
+import numpy as np
+
+from heuristics import get_heuristic
+from search_stats import SearchStats
+
+NEIGHBOURS = [(d_row, d_col, math.hypot(d_row, d_col)) for d_row, d_col in
+              [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1)]]
+
+# cell states of a search
+BLOCKED = 0
+FREE = 1
+CLOSED = 2
+
+
+class SearchObserver:
+    def node_opened(self, position):
+        pass
+
+    def node_closed(self, position):
+        pass
+
+    def path_found(self, path):
+        pass
+
+
+class Node:
+    # read-only view of one cell of the last search, for code written against
+    # the per-node objects the solver used to allocate
+    __slots__ = ('solver', 'index')
+
+    def __init__(self, solver, index):
+        self.solver = solver
+        self.index = index
+
+    @property
+    def position(self):
+        return self.solver.position(self.index)
+
+    @property
+    def parent(self):
+        parent = self.solver.parent[self.index]
+        return Node(self.solver, parent) if parent != -1 else None
+
+    @property
+    def g(self):
+        return self.solver.g_score[self.index]
+
+    @property
+    def h(self):
+        row, col = self.position
+        end_row, end_col = self.solver.end
+        return self.solver.heuristic(abs(row - end_row), abs(col - end_col))
+
+    @property
+    def f(self):
+        return self.g + self.h
+
+    def __eq__(self, other):
+        return self.position == other.position
+
+
+class Solver:
+    def __init__(self, matrix, observer=None, heuristic='octile', weight=1.0, stats_sink=None):
+        self.matrix = matrix
+        self.observer = observer
+        # called with the SearchStats of every finished search
+        self.stats_sink = stats_sink
+        self.heuristic_name = heuristic
+        self.weight = weight
+        self.heuristic = get_heuristic(heuristic, weight)
+        self.cost = None
+        self.expanded = 0
+        self.stats = None
+
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        # a ring of blocked cells around the map lets neighbours be found by adding
+        # a fixed offset to the flat index, without any bounds checks
+        self.width = self.cols + 2
+        padded = np.zeros((self.rows + 2, self.width), dtype=np.uint8)
+        padded[1:-1, 1:-1] = np.asarray(matrix) == 1
+        self.walkable = padded.tobytes()
+        self.offsets = [(d_row * self.width + d_col, d_row, d_col, step)
+                        for d_row, d_col, step in NEIGHBOURS]
+
+        # struct-of-arrays search state over the padded grid, index = row * width + col
+        self.start = None
+        self.end = None
+        self.g_score = None
+        self.parent = None
+        self.state = None
+        self.path = None
+
+    def index(self, position):
+        return (position[0] + 1) * self.width + position[1] + 1
+
+    def position(self, index):
+        row, col = divmod(index, self.width)
+        return (row - 1, col - 1)
+
+    def node(self, position):
+        return Node(self, self.index(position))
+
+    def as_numpy(self):
+        # zero-copy (rows, cols) views of the g-score, parent index and state arrays;
+        # parent values are indices into the padded grid
+        shape = (self.rows + 2, self.width)
+        return (np.frombuffer(self.g_score, dtype=np.float64).reshape(shape)[1:-1, 1:-1],
+                np.frombuffer(self.parent, dtype=np.int32).reshape(shape)[1:-1, 1:-1],
+                np.frombuffer(self.state, dtype=np.uint8).reshape(shape)[1:-1, 1:-1])
+
+    def create_path(self, start, end):
+        observer = self.observer
+        if observer is None:
+            for _ in self.search(start, end):
+                pass
+            return self.path
+
+        for opened, closed in self.search(start, end, batch=1):
+            for position in closed:
+                observer.node_closed(position)
+            for position in opened:
+                observer.node_opened(position)
+        if self.path is not None:
+            observer.path_found(self.path)
+        return self.path
+
+    def search(self, start, end, batch=None):
+        # generator that runs the search; with a batch size it yields (opened,
+        # closed) lists of cells every batch expansions, so callers can draw or
+        # stop it between batches. The result ends up in path, cost, expanded
+        # and stats; the phase times leave out the time spent between batches.
+        clock = time.perf_counter
+        started = clock()
+        self.stats = stats = SearchStats()
+        times = stats.times
+        self.start = start
+        self.end = end
+        self.path = None
+        self.cost = None
+        self.expanded = 0
+        heuristic = self.heuristic
+        offsets = self.offsets
+        width = self.width
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        record = batch is not None
+        opened = []
+        closed = []
+
+        size = len(self.walkable)
+        self.g_score = g_score = array('d', [math.inf]) * size
+        self.parent = parent = array('i', [-1]) * size
+        self.state = state = bytearray(self.walkable)
+
+        start_index = self.index(start)
+        end_index = self.index(end)
+        end_row, end_col = divmod(end_index, width)
+        start_row, start_col = divmod(start_index, width)
+
+        # ties on f go to the node closer to the end, then to the one pushed first
+        counter = 0
+        expanded = 0
+        g_score[start_index] = 0.0
+        h = heuristic(abs(start_row - end_row), abs(start_col - end_col))
+        open_heap = [(h, h, counter, start_index)]
+        decreased = 0
+        peak_open = 1
+        now = clock()
+        times['setup'] = now - started
+        started = now
+
+        while open_heap:
+            current = heappop(open_heap)[3]
+            if state[current] == CLOSED:
+                continue
+            state[current] = CLOSED
+            expanded += 1
+            row, col = divmod(current, width)
+            if record:
+                closed.append((row - 1, col - 1))
+
+            if current == end_index:
+                now = clock()
+                times['search'] += now - started
+                started = now
+                self.expanded = expanded
+                self.cost = g_score[current]
+                path = []
+                while current != -1:
+                    row, col = divmod(current, width)
+                    path.append((row - 1, col - 1))
+                    current = parent[current]
+                path.reverse()
+                self.path = path
+                times['path'] = clock() - started
+                break
+
+            current_g = g_score[current]
+            for delta, d_row, d_col, step in offsets:
+                index = current + delta
+                if state[index] != FREE:
+                    continue
+
+                g = current_g + step
+                if g < g_score[index]:
+                    if parent[index] != -1:
+                        decreased += 1
+                    g_score[index] = g
+                    parent[index] = current
+                    counter += 1
+                    h = heuristic(abs(row + d_row - end_row), abs(col + d_col - end_col))
+                    # rounding lets float noise in g still count as a tie on f, which
+                    # keeps octile plateaus from being flooded; the cost error is < 1e-9
+                    heappush(open_heap, (round(g + h, 9), h, counter, index))
+                    if record:
+                        opened.append((row + d_row - 1, col + d_col - 1))
+            if len(open_heap) > peak_open:
+                peak_open = len(open_heap)
+
+            if record and len(closed) >= batch:
+                self.expanded = expanded
+                times['search'] += clock() - started
+                yield opened, closed
+                started = clock()
+                opened = []
+                closed = []
+
+        if self.path is None:
+            times['search'] += clock() - started
+        self.expanded = expanded
+        # the heuristic runs once per heap entry, and every entry popped
+        # without an expansion was stale
+        stats.expanded = expanded
+        stats.generated = counter
+        stats.decreased = decreased
+        stats.stale = counter + 1 - len(open_heap) - expanded
+        stats.peak_open = peak_open
+        stats.heuristic_calls = counter + 1
+        if self.stats_sink is not None:
+            self.stats_sink(stats)
+        if record and (opened or closed):
+            yield opened, closed
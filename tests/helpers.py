@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from backends import get_backend
+from benchmarks.maps import generate, make_queries
+
+
+def random_edits(matrix, rng, count):
+    # count cells flipped between wall and free, in one batch
+    cells = [tuple(int(value) for value in cell)
+             for cell in rng.integers(0, len(matrix), size=(count, 2))]
+    for row, col in cells:
+        matrix[row][col] = 1 - matrix[row][col]
+    return cells
+
+
+def check_update_cells(name, seed):
+    # after each batch of edits the backend answers like one built on the new map
+    rng = np.random.default_rng(seed)
+    matrix = generate('random30', 48, seed)
+    queries = make_queries(matrix, 4, seed)
+    backend = get_backend(name, matrix.copy())
+    for count in (1, 5, 40):
+        for start, end in queries:
+            backend.search(start, end)
+        cells = random_edits(matrix, rng, count)
+        backend.update_cells(cells, matrix.copy())
+        fresh = get_backend(name, matrix.copy())
+        for start, end in queries:
+            result = backend.search(start, end)
+            expected = fresh.search(start, end)
+            assert result.found == expected.found
+            if expected.found:
+                assert result.path[0] == tuple(start) and result.path[-1] == tuple(end)
+                assert all(matrix[row][col] == 1 for row, col in result.path)
+                assert result.cost == pytest.approx(expected.cost)
+
+
+def check_wall_on_an_open_diagonal(name, rel=1e-9):
+    # g + h of the walled cell ties with the cost of the end up to float noise
+    matrix = np.ones((50, 50), dtype=int)
+    backend = get_backend(name, matrix.copy())
+    backend.search((0, 0), (49, 49))
+    matrix[40, 40] = 0
+    backend.update_cells([(40, 40)], matrix.copy())
+    result = backend.search((0, 0), (49, 49))
+    assert (40, 40) not in result.path
+    assert result.cost == pytest.approx(get_backend('a_star', matrix).search((0, 0), (49, 49)).cost,
+                                        rel=rel)
@@ -0,0 +1,132 @@
+import math
+
+import numpy as np
+import pytest
+
+from backends import BACKENDS, available_backends, get_backend, path_cost
+from benchmarks.maps import generate, make_queries
+from line_of_sight import LineOfSight
+
+# how far above the A* cost each backend's paths may be
+COST_BOUND = {
+    'weighted_a_star': 1.5,
+    # about 1% over on average, up to 19% when a room route takes the wrong door
+    'hpa': 1.2,
+}
+MAPS = [('open', 0), ('random10', 0), ('random30', 1), ('maze', 2), ('rooms', 3)]
+
+
+def backends():
+    names = []
+    for name in available_backends():
+        package = BACKENDS[name].requires
+        if package is not None:
+            names.append(pytest.param(name, marks=pytest.mark.skipif(
+                not has_module(package), reason=f'needs the {package} package')))
+        else:
+            names.append(name)
+    return names
+
+
+def has_module(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def check_path(matrix, path, start, end, any_angle=False):
+    assert path[0] == start and path[-1] == end
+    if any_angle:
+        sight = LineOfSight(matrix)
+        assert all(sight.visible(a, b) for a, b in zip(path, path[1:]))
+        return
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert max(abs(row - next_row), abs(col - next_col)) == 1
+    assert all(matrix[row][col] > 0 for row, col in path)
+
+
+def check_result(name, matrix, result, expected, start, end):
+    if expected.path is None:
+        assert result.path is None
+        return
+    assert result.path is not None
+    check_path(matrix, result.path, start, end, BACKENDS[name].any_angle)
+    if BACKENDS[name].weighted:
+        # terrain costs count diagonals as 1.4, so only the path is comparable
+        assert path_cost(result.path) >= expected.cost - 1e-9
+    elif BACKENDS[name].any_angle:
+        assert math.dist(start, end) - 1e-9 <= result.cost <= expected.cost + 1e-9
+    else:
+        assert result.cost == pytest.approx(path_cost(result.path))
+        assert expected.cost - 1e-9 <= result.cost <= expected.cost * COST_BOUND.get(name, 1.0) + 1e-9
+
+
+@pytest.mark.parametrize('name', backends())
+@pytest.mark.parametrize('map_name, seed', MAPS)
+def test_backend_matches_a_star(name, map_name, seed):
+    matrix = generate(map_name, 48, seed)
+    queries = make_queries(matrix, 12, seed)
+    reference = get_backend('a_star', matrix)
+    backend = get_backend(name, matrix)
+    for start, end in queries:
+        expected = reference.search(start, end)
+        result = backend.search(start, end)
+        check_result(name, matrix, result, expected, tuple(start), tuple(end))
+
+
+@pytest.mark.parametrize('name', backends())
+def test_unreachable_end(name):
+    matrix = np.ones((12, 12), dtype=int)
+    matrix[:, 6] = 0
+    result = get_backend(name, matrix).search((0, 0), (11, 11))
+    assert result.path is None and result.cost is None
+
+
+@pytest.mark.parametrize('name', backends())
+@pytest.mark.parametrize('start, end', [((0, 0), (5, 5)), ((5, 5), (0, 0)), ((5, 5), (5, 5))])
+def test_ends_on_a_wall(name, start, end):
+    matrix = np.ones((8, 8), dtype=int)
+    matrix[5, 5] = 0
+    backend = get_backend(name, matrix)
+    result = backend.search(start, end)
+    assert result.path is None and result.cost is None
+    try:
+        next(backend.search_steps(start, end))
+    except StopIteration as done:
+        result = done.value
+    else:
+        result = backend.search(start, end)
+    assert result.path is None
+
+
+@pytest.mark.parametrize('name', backends())
+def test_start_is_end(name):
+    matrix = generate('random10', 16, 0)
+    matrix[3, 4] = 1
+    result = get_backend(name, matrix).search((3, 4), (3, 4))
+    assert result.path == [(3, 4)]
+    assert result.cost == 0
+
+
+@pytest.mark.parametrize('name', [name for name in available_backends()
+                                  if name != 'library' and not BACKENDS[name].weighted])
+def test_smoothed_paths_keep_line_of_sight(name):
+    matrix = generate('random30', 40, 5)
+    backend = get_backend(name, matrix, smooth=True)
+    for start, end in make_queries(matrix, 8, 5):
+        result = backend.search(start, end)
+        if result.found:
+            check_path(matrix, result.path, tuple(start), tuple(end), any_angle=True)
+
+
+def test_bidirectional_does_not_flood_open_maps():
+    # every cell between the ends lies on an optimal path, so each side should
+    # run straight at the other instead of expanding the whole plateau
+    matrix = generate('open', 128, 0)
+    for start, end in [((0, 0), (127, 50)), ((100, 110), (20, 10))]:
+        one_way = get_backend('a_star', matrix).search(start, end)
+        two_way = get_backend('bidirectional', matrix).search(start, end)
+        assert two_way.cost == pytest.approx(one_way.cost)
+        assert two_way.expanded <= one_way.expanded + 2
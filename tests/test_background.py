@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+import game
+from background import Worker
+from game import SEARCH_BATCH, Game
+
+
+def producer(job, count, produced):
+    for index in range(count):
+        job.put(index)
+        produced.append(index)
+    return count
+
+
+def test_limit_holds_the_job_back_until_batches_are_taken():
+    worker = Worker()
+    produced = []
+    job = worker.submit(producer, 10, produced, limit=3)
+    try:
+        assert not job.wait(0.2)
+        assert len(job.batches) == 3
+        taken = [job.take() for _ in range(3)]
+        while not job.done():
+            if job.batches:
+                taken.append(job.take())
+        taken.extend(job.take() for _ in range(len(job.batches)))
+        assert taken == list(range(10))
+        assert job.result == 10
+    finally:
+        worker.stop()
+
+
+def test_cancel_wakes_a_waiting_job():
+    worker = Worker()
+    job = worker.submit(producer, 10, [], limit=1)
+    assert not job.wait(0.1)
+    job.cancel()
+    assert job.wait(5)
+    worker.stop()
+
+
+def test_release_without_keep_drops_batches():
+    worker = Worker()
+    started = threading.Event()
+
+    def slow(job):
+        job.put('first')
+        started.set()
+        job.cancelled.wait(0.1)
+        job.put('second')
+        return 'done'
+
+    job = worker.submit(slow, limit=1)
+    started.wait(5)
+    job.release(keep=False)
+    assert job.wait(5)
+    assert job.result == 'done' and not job.batches
+    worker.stop()
+
+
+def test_game_search_runs_without_a_reader(monkeypatch):
+    # more batches than the limit, with nobody drawing them
+    monkeypatch.setattr(game, 'MAX_PENDING_STEPS', 2)
+    board = Game(backend='a_star', rows=60, cols=60)
+    result = board.search((0, 0), (59, 30))
+    assert result.found
+    assert result.expanded > SEARCH_BATCH * 2
+    assert not board.worker.current.batches
+    board.worker.stop()
+
+
+def test_game_rejects_smoothing_terrain_backends():
+    # the worker would only find out on the first search and end the game
+    with pytest.raises(ValueError, match='terrain'):
+        Game(backend='terrain', smooth=True)
+
+
+def test_game_rejects_unknown_backends():
+    with pytest.raises(ValueError, match='expected one of'):
+        Game(backend='dijkstra')
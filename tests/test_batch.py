@@ -0,0 +1,55 @@
+from multiprocessing import shared_memory
+
+import pytest
+
+import batch
+from batch import solve_batch
+from benchmarks.maps import generate, make_queries
+from solver import Solver
+
+
+@pytest.fixture
+def segments(monkeypatch):
+    # names of the shared memory segments solve_batch creates
+    names = []
+
+    class Recorded(shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if kwargs.get('create'):
+                names.append(self.name)
+
+    monkeypatch.setattr(batch.shared_memory, 'SharedMemory', Recorded)
+    return names
+
+
+def unlinked(name):
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return True
+    return False
+
+
+def test_pool_matches_solver_in_order(segments):
+    matrix = generate('random30', 40, 4)
+    queries = make_queries(matrix, 30, 4)
+    results = sorted(solve_batch(matrix, queries, processes=2, chunksize=4))
+    assert [index for index, _ in results] == list(range(len(queries)))
+
+    solver = Solver(matrix)
+    for (_, result), (start, end) in zip(results, queries):
+        path = solver.create_path(tuple(start), tuple(end))
+        assert result.found == (path is not None)
+        if path is not None:
+            assert result.cost == pytest.approx(solver.cost)
+    assert len(segments) == 1 and unlinked(segments[0])
+
+
+def test_segment_is_unlinked_when_a_worker_raises(segments):
+    matrix = generate('random10', 16, 0)
+    # a cell off the map makes the worker's search raise
+    queries = [((0, 0), (0, 0)), ((0, 0), (40, 40))]
+    with pytest.raises(IndexError):
+        list(solve_batch(matrix, queries, processes=2, chunksize=1))
+    assert len(segments) == 1 and unlinked(segments[0])
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from benchmarks.maps import generate
+from components import ComponentIndex, label
+from tests.helpers import random_edits
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_components_follow_edits(seed):
+    rng = np.random.default_rng(seed)
+    matrix = generate('random30', 32, seed)
+    index = ComponentIndex(matrix)
+    for count in (1, 3, 20, 1, 1):
+        cells = random_edits(matrix, rng, count)
+        index.update_cells(cells, matrix)
+        labels, count = label(matrix == 1)
+        assert index.count == count
+        # the same partition of the free cells, whatever the label numbers
+        pairs = set(zip(index.labels.ravel().tolist(), labels.ravel().tolist()))
+        assert len(pairs) == count + 1
+
+
+def test_connected_across_a_wall():
+    matrix = np.ones((10, 10), dtype=int)
+    matrix[:, 5] = 0
+    index = ComponentIndex(matrix)
+    assert index.connected((0, 0), (9, 4))
+    assert not index.connected((0, 0), (0, 9))
+    # a gap in the wall joins the two sides
+    matrix[9, 5] = 1
+    index.update_cells([(9, 5)], matrix)
+    assert index.connected((0, 0), (0, 9))
+    # walls belong to no region
+    assert not index.connected((0, 5), (0, 5))
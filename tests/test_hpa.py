@@ -0,0 +1,40 @@
+import pytest
+
+from benchmarks.maps import generate, make_queries
+from hpa import HierarchicalPlanner
+from solver import Solver
+from tests.helpers import check_update_cells, check_wall_on_an_open_diagonal
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_update_cells_matches_a_fresh_backend(seed):
+    check_update_cells('hpa', seed)
+
+
+def test_wall_on_an_open_diagonal():
+    check_wall_on_an_open_diagonal('hpa', rel=0.15)
+
+
+def test_edits_rebuild_only_nearby_clusters():
+    matrix = generate('random10', 64, 0)
+    planner = HierarchicalPlanner(matrix)
+    before = dict(planner.intra)
+    matrix[5, 5] = 1 - matrix[5, 5]
+    planner.update_cells([(5, 5)], matrix)
+    rebuilt = {cluster for cluster in before if planner.intra[cluster] is not before[cluster]}
+    assert (0, 0) in rebuilt
+    assert rebuilt <= {(0, 0), (0, 1), (1, 0), (1, 1)}
+
+
+@pytest.mark.parametrize('size', [37, 41, 64])
+def test_open_maps_get_straight_paths(size):
+    # long border runs route through their ends, which smoothing undoes
+    matrix = generate('open', size, 0)
+    planner = HierarchicalPlanner(matrix)
+    solver = Solver(matrix)
+    for start, end in make_queries(matrix, 20, size):
+        path = planner.create_path(start, end)
+        solver.create_path(start, end)
+        assert path[0] == tuple(start) and path[-1] == tuple(end)
+        assert all(max(abs(a[0] - b[0]), abs(a[1] - b[1])) == 1 for a, b in zip(path, path[1:]))
+        assert planner.cost == pytest.approx(solver.cost)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from backends import get_backend
+from benchmarks.maps import generate
+from lpa_star import IncrementalPlanner
+from tests.helpers import check_update_cells, check_wall_on_an_open_diagonal, random_edits
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_update_cells_matches_a_fresh_backend(seed):
+    check_update_cells('lpa', seed)
+
+
+def test_wall_on_an_open_diagonal():
+    check_wall_on_an_open_diagonal('lpa')
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_lpa_on_an_open_board(seed):
+    # edits on an open board, where ties between keys are everywhere
+    rng = np.random.default_rng(seed)
+    matrix = np.ones((40, 40), dtype=int)
+    backend = get_backend('lpa', matrix.copy())
+    for _ in range(30):
+        cells = random_edits(matrix, rng, 3)
+        matrix[0, 0] = matrix[39, 39] = 1
+        backend.update_cells(cells + [(0, 0), (39, 39)], matrix.copy())
+        result = backend.search((0, 0), (39, 39))
+        expected = get_backend('a_star', matrix).search((0, 0), (39, 39))
+        assert result.found == expected.found
+        if expected.found:
+            assert result.cost == pytest.approx(expected.cost)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2, 3])
+def test_replanning_repairs_less_than_a_fresh_search(seed):
+    # a wall late on the path only invalidates the search beyond it
+    matrix = generate('random30', 64, seed)
+    matrix[0, 0] = matrix[63, 63] = 1
+    planner = IncrementalPlanner(matrix)
+    path = planner.create_path((0, 0), (63, 63))
+    cell = path[len(path) * 3 // 4]
+    matrix[cell] = 0
+    planner.update_cells([cell], matrix)
+    planner.create_path((0, 0), (63, 63))
+
+    fresh = IncrementalPlanner(matrix)
+    fresh.create_path((0, 0), (63, 63))
+    assert planner.cost == pytest.approx(fresh.cost)
+    assert planner.expanded < fresh.expanded / 3
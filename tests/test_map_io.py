@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from benchmarks.maps import generate
+from map_io import (PackedMap, create_map, load_map, map_weighted, open_map, read_movingai,
+                    read_scenarios, save_map, write_movingai)
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_compact_round_trip(tmp_path, packed):
+    # 37 columns, so packed rows end in a partial byte
+    matrix = generate('random30', 37, 0)[:29]
+    path = str(tmp_path / 'grid.gmap')
+    save_map(path, matrix, packed=packed)
+    loaded = open_map(path)
+    assert isinstance(loaded, PackedMap) == packed
+    assert np.array_equal(np.asarray(loaded), matrix)
+    assert loaded[5].tolist() == matrix[5].tolist()
+    assert not map_weighted(path)
+    if packed:
+        assert np.array_equal(loaded.window(3, 5, 20, 30), matrix[3:20, 5:30])
+
+
+def test_open_map_maps_the_file(tmp_path):
+    # the cells stay on disk until read, and writable maps write straight through
+    path = str(tmp_path / 'grid.gmap')
+    save_map(path, generate('random10', 64, 2))
+    assert isinstance(open_map(path), np.memmap)
+    matrix = open_map(path, 'r+')
+    matrix[1, 2] = 0
+    matrix.flush()
+    del matrix
+    assert open_map(path)[1, 2] == 0
+    with pytest.raises(ValueError):
+        open_map(path)[1, 2] = 1
+
+
+def test_movingai_round_trip(tmp_path):
+    matrix = generate('maze', 33, 2)
+    path = str(tmp_path / 'maze.map')
+    write_movingai(path, matrix)
+    assert np.array_equal(read_movingai(path), matrix)
+    assert np.array_equal(load_map(path), matrix)
+    assert not map_weighted(path)
+
+
+def test_movingai_terrain_and_line_endings(tmp_path):
+    path = tmp_path / 'small.map'
+    path.write_bytes(b'type octile\r\nheight 2\r\nwidth 3\r\nmap\r\n.GT\r\nS@W')
+    assert read_movingai(str(path)).tolist() == [[1, 1, 0], [1, 0, 0]]
+
+
+def test_read_scenarios(tmp_path):
+    path = tmp_path / 'small.map.scen'
+    path.write_text('version 1\n0\tsmall.map\t3\t2\t0\t1\t2\t0\t2.41421356\n')
+    # x, y in the file; row, col in the queries
+    assert read_scenarios(str(path)) == [((1, 0), (0, 2), 2.41421356)]
+
+
+def test_create_map_writes_through(tmp_path):
+    path = str(tmp_path / 'big.gmap')
+    matrix = create_map(path, 10, 12)
+    matrix[4, 5] = 0
+    matrix.flush()
+    loaded = open_map(path)
+    assert loaded.shape == (10, 12)
+    assert loaded[4, 5] == 0 and loaded.sum() == 119
+
+
+def test_not_a_map(tmp_path):
+    path = tmp_path / 'junk.gmap'
+    path.write_bytes(b'x' * 100)
+    with pytest.raises(ValueError):
+        open_map(str(path))
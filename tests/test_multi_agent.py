@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from benchmarks.maps import generate
+from multi_agent import MultiAgentPlanner
+
+
+def timelines(agents, paths):
+    # the cell of every agent at every time step; agents with their own
+    # destination, and stuck ones, stay put for good, the others leave on arrival
+    ends = [end for _, end in agents]
+    horizon = max(len(path) for path in paths if path) + 1
+    lines = []
+    for (start, end), path in zip(agents, paths):
+        if path is None:
+            lines.append([start] * horizon)
+        elif ends.count(end) == 1:
+            lines.append(path + [path[-1]] * (horizon - len(path)))
+        else:
+            lines.append(path + [None] * (horizon - len(path)))
+    return lines
+
+
+def check_no_conflicts(agents, paths):
+    lines = timelines(agents, paths)
+    for t in range(len(lines[0])):
+        cells = [line[t] for line in lines if line[t] is not None]
+        assert len(cells) == len(set(cells)), f'two agents share a cell at t={t}'
+        if t + 1 == len(lines[0]):
+            break
+        moves = {(line[t], line[t + 1]) for line in lines
+                 if line[t] is not None and line[t + 1] is not None and line[t] != line[t + 1]}
+        assert not any((after, before) in moves for before, after in moves), \
+            f'two agents swap cells at t={t}'
+
+
+def check_steps(matrix, path, start, end):
+    assert path[0] == start and path[-1] == end
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert max(abs(row - next_row), abs(col - next_col)) <= 1
+        assert matrix[next_row][next_col] == 1
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_cooperative_paths_do_not_collide(seed):
+    rng = np.random.default_rng(seed)
+    matrix = generate('random10', 20, seed)
+    free = [tuple(cell) for cell in np.argwhere(matrix == 1).tolist()]
+    cells = [free[index] for index in rng.choice(len(free), size=17, replace=False)]
+    # four agents share one destination, the rest have their own
+    starts, ends = cells[:10], cells[10:]
+    agents = [(start, ends[0] if agent < 4 else ends[agent - 3])
+              for agent, start in enumerate(starts)]
+
+    paths = MultiAgentPlanner(matrix, cooperative=True).plan(agents)
+    assert sum(path is not None for path in paths) >= 8
+    for (start, end), path in zip(agents, paths):
+        if path is not None:
+            check_steps(matrix, path, start, end)
+    check_no_conflicts(agents, paths)
+
+
+def test_head_on_agents_pass_in_a_bay():
+    # a one-cell corridor with a bay in the middle: one agent has to step aside
+    matrix = np.zeros((3, 9), dtype=int)
+    matrix[1, :] = 1
+    matrix[0, 4] = 1
+    agents = [((1, 0), (1, 8)), ((1, 8), (1, 0))]
+
+    paths = MultiAgentPlanner(matrix, cooperative=True).plan(agents)
+    assert all(path is not None for path in paths)
+    assert any((0, 4) in path for path in paths)
+    check_no_conflicts(agents, paths)
@@ -0,0 +1,27 @@
+from benchmarks.maps import generate
+from path_cache import PathCache, map_key
+
+
+def test_path_cache_evicts_and_drops_old_versions():
+    cache = PathCache(maxsize=2)
+    cache.put(1, (0, 0), (1, 1), [(0, 0), (1, 1)])
+    cache.put(1, (0, 0), (2, 2), None)
+    # no path is stored as an empty list, a miss is None
+    assert cache.get(1, (0, 0), (2, 2)) == []
+    assert cache.get(1, (0, 0), (1, 1)) == [(0, 0), (1, 1)]
+    # the least recently used entry goes
+    cache.put(1, (0, 0), (3, 3), [(0, 0)])
+    assert cache.get(1, (0, 0), (1, 1)) is not None
+    assert cache.get(1, (0, 0), (2, 2)) is None
+    assert cache.evictions == 1
+
+    assert cache.get(2, (0, 0), (1, 1)) is None
+    assert len(cache) == 0
+
+
+def test_map_key_follows_the_walls():
+    matrix = generate('random10', 16, 0)
+    key = map_key(matrix)
+    assert map_key(matrix.copy()) == key
+    matrix[0, 0] = 1 - matrix[0, 0]
+    assert map_key(matrix) != key
@@ -0,0 +1,42 @@
+import logging
+
+import numpy as np
+
+from backends import get_backend
+from search_stats import LogSink
+from solver import Solver
+
+
+def test_decreased_counts_cheaper_routes_to_open_cells():
+    # (2, 0) is first reached diagonally from (1, 1) at g = 1 + sqrt(2), then
+    # straight down from (1, 0) at g = 2 while it is still open
+    matrix = np.array([[1, 0, 0, 1],
+                       [1, 1, 0, 1],
+                       [1, 1, 1, 1]])
+    solver = Solver(matrix)
+    solver.create_path((0, 0), (0, 3))
+    stats = solver.stats
+    assert stats.decreased == 1
+    assert stats.expanded == 6
+    assert stats.generated == 9
+    # the old entry of (2, 0) is still queued when the end is reached
+    assert stats.stale == 0
+    assert stats.heuristic_calls == stats.generated + 1
+
+
+def test_nothing_decreases_on_a_straight_corridor():
+    solver = Solver(np.ones((1, 6), dtype=int))
+    solver.create_path((0, 0), (0, 5))
+    assert solver.stats.decreased == 0
+    assert solver.stats.expanded == 6
+    assert solver.stats.as_dict()['decreased'] == 0
+
+
+def test_log_sink_gets_every_search(caplog):
+    backend = get_backend('a_star', np.ones((4, 4), dtype=int))
+    backend.stats_sink = LogSink()
+    with caplog.at_level(logging.INFO, logger='pathfinder.search'):
+        backend.search((0, 0), (3, 3))
+        backend.search((3, 0), (0, 3))
+    assert len(caplog.records) == 2
+    assert 'decreased=0' in caplog.records[0].getMessage()
@@ -0,0 +1,29 @@
+import pytest
+
+from backends import get_backend
+from line_of_sight import LineOfSight
+
+
+def segments_clear(matrix, path):
+    sight = LineOfSight(matrix)
+    return all(sight.visible(a, b) for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize('name', ['lpa', 'hpa'])
+def test_smoothing_sees_walls_added_by_update_cells(name):
+    matrix = [[1] * 20 for _ in range(20)]
+    backend = get_backend(name, matrix, smooth=True)
+    assert backend.search((0, 0), (19, 19)).path == [(0, 0), (19, 19)]
+
+    # a wall across the diagonal with a gap at the right edge
+    matrix = [row[:] for row in matrix]
+    changes = []
+    for col in range(19):
+        matrix[10][col] = 0
+        changes.append((10, col))
+    backend.update_cells(changes, matrix)
+
+    path = backend.search((0, 0), (19, 19)).path
+    assert path is not None
+    assert segments_clear(matrix, path)
+    assert all(matrix[row][col] == 1 for row, col in path)
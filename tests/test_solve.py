@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import solve
+from map_io import save_map, write_movingai
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(tmp_path, map_path, queries, *options):
+    query_path = tmp_path / 'queries.txt'
+    query_path.write_text(queries)
+    output_path = tmp_path / 'paths.jsonl'
+    status = solve.main([str(map_path), '--queries', str(query_path),
+                         '--output', str(output_path), *options])
+    return status, [json.loads(line) for line in output_path.read_text().splitlines()]
+
+
+@pytest.fixture
+def board(tmp_path):
+    matrix = np.ones((6, 8), dtype=np.uint8)
+    matrix[:5, 4] = 0
+    path = tmp_path / 'board.map'
+    write_movingai(str(path), matrix)
+    return path
+
+
+def test_query_formats(tmp_path, board):
+    status, records = run(tmp_path, board, '0 0 0 7\n'
+                                           '# comment\n'
+                                           '[[0, 0], [0, 7]]\n'
+                                           '{"start": [0, 0], "end": [0, 7]}\n')
+    assert status == 0
+    assert [record['index'] for record in records] == [0, 1, 2]
+    assert [record['line'] for record in records] == [1, 3, 4]
+    paths = [record['path'] for record in records]
+    assert paths[0] == paths[1] == paths[2]
+    assert paths[0][0] == [0, 0] and paths[0][-1] == [0, 7]
+    assert [5, 4] in paths[0]
+
+
+def test_bad_queries_are_reported_in_order(tmp_path, board):
+    status, records = run(tmp_path, board, '0 0 9 9\nnot a query\n0 0 5 7\n')
+    assert status == 1
+    assert 'off the 6x8 map' in records[0]['error']
+    assert records[1]['error'].startswith('bad query')
+    assert records[2]['path'][-1] == [5, 7]
+
+
+def test_smooth_and_stats(tmp_path, board):
+    _, records = run(tmp_path, board, '0 0 0 7\n', '--smooth', '--stats', '--backend', 'jps')
+    assert len(records[0]['path']) < 9
+    assert records[0]['stats']['expanded'] == records[0]['expanded']
+
+
+def test_weighted_map_for_every_kind_of_backend(tmp_path):
+    weights = np.full((5, 5), 3, dtype=np.uint8)
+    weights[2, :4] = 0
+    path = tmp_path / 'terrain.gmap'
+    save_map(str(path), weights, weighted=True)
+    _, records = run(tmp_path, path, '0 0 4 0\n')
+    assert records[0]['path'] is not None
+    assert records[0]['cost'] == pytest.approx(4 + 4 * 2 ** 0.5)
+    _, records = run(tmp_path, path, '0 0 4 0\n', '--backend', 'terrain')
+    assert records[0]['cost'] == pytest.approx(28.8)
+
+
+def test_cells_need_two_coordinates(tmp_path, board):
+    status, records = run(tmp_path, board, '{"start": [0], "end": [1, 1]}\n'
+                                           '[[0, 0], [5, 7, 3]]\n'
+                                           '{"start": 5, "end": [1, 1]}\n'
+                                           '0 0 5 7\n')
+    assert status == 1
+    assert all(record['error'].startswith('bad query') for record in records[:3])
+    assert records[3]['path'][-1] == [5, 7]
+
+
+def test_headless_runs_do_not_load_pygame(tmp_path, board):
+    # the GUI modules import pygame on first use, so a headless solve never does
+    script = ('import sys, a_star, game, renderer, solve\n'
+              f'solve.main([{str(board)!r}, "--queries", {str(tmp_path / "q.txt")!r}])\n'
+              'assert "pygame" not in sys.modules\n')
+    (tmp_path / 'q.txt').write_text('0 0 0 7\n')
+    done = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True)
+    assert done.returncode == 0, done.stderr
+    assert json.loads(done.stdout)['path'][-1] == [0, 7]
@@ -0,0 +1,66 @@
+import pytest
+
+from viewport import Viewport
+
+
+def test_zoom_levels_go_down_until_the_board_fits():
+    view = Viewport(2000, 2000, 800, 600)
+    # 1 pixel per cell is too big, 1/2 still is, 1/4 fits 500 x 500 pixels
+    assert view.sizes[-3:] == [1, 1 / 2, 1 / 4]
+    assert view.size == 16
+    assert Viewport(40, 40, 800, 600).sizes[-1] == 1
+
+
+def test_zoom_stops_at_both_ends():
+    view = Viewport(2000, 2000, 800, 600)
+    view.zoom(100, 400, 300)
+    assert view.level == 0 and view.size == 64
+    view.zoom(-100, 400, 300)
+    assert view.size == 1 / 4 and view.step == 4
+    assert (view.top, view.left) == (0.0, 0.0)
+
+
+def test_zoom_keeps_the_cell_under_the_pointer():
+    view = Viewport(2000, 2000, 800, 600)
+    view.scroll(8000, 8000)
+    cell = view.cell_at(400, 300)
+    view.zoom(1, 400, 300)
+    assert view.cell_at(400, 300) == cell
+    view.zoom(-2, 400, 300)
+    assert view.cell_at(400, 300) == cell
+
+
+@pytest.mark.parametrize('levels', [2, -2])
+def test_zoom_at_the_far_corner_stays_on_the_board(levels):
+    view = Viewport(300, 500, 800, 600)
+    view.scroll(10 ** 6, 10 ** 6)
+    view.zoom(levels, 799, 599)
+    top, left, bottom, right, _ = view.window()
+    assert 0 <= top and 0 <= left
+    assert (bottom, right) == (300, 500)
+    assert view.cell_at(799, 599) == (299, 499)
+
+
+def test_window_is_clamped_to_the_board():
+    view = Viewport(100, 100, 800, 600, size=32)
+    view.scroll(-500, -500)
+    assert view.window() == (0, 0, 19, 25, 1)
+    view.scroll(10 ** 5, 10 ** 5)
+    assert view.window() == (81, 75, 100, 100, 1)
+    # a board smaller than the area never scrolls
+    small = Viewport(10, 10, 800, 600)
+    small.scroll(300, 300)
+    assert small.window() == (0, 0, 10, 10, 1)
+
+
+def test_hit_test_zoomed_out():
+    view = Viewport(2000, 2000, 800, 600)
+    view.zoom(-100, 0, 0)
+    assert view.cell_at(0, 0) == (0, 0)
+    assert view.cell_at(100, 50) == (200, 400)
+    assert view.cell_at(499, 499) == (1996, 1996)
+    # the board is 500 pixels wide at 1/4, the area around it is off the board
+    assert view.cell_at(500, 10) is None
+    assert view.cell_at(10, 599) is None
+    assert view.cell_at(-1, 10) is None and view.cell_at(800, 10) is None
+    assert view.window() == (0, 0, 2000, 2000, 4)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from benchmarks.maps import terrain_map
+from map_io import load_map, map_weighted, save_map, store_map
+from weighted import HeapWeightedSolver, WeightedSolver
+
+
+@pytest.mark.parametrize('solver_class', [WeightedSolver, HeapWeightedSolver])
+def test_expensive_terrain_is_walked_around(solver_class):
+    # crossing the weight-9 strip costs 9 steps, going under it only diagonals
+    weights = np.ones((3, 5), dtype=int)
+    weights[:2, 2] = 9
+    solver = solver_class(weights)
+    path = solver.create_path((0, 0), (0, 4))
+    assert path == [(0, 0), (1, 1), (2, 2), (1, 3), (0, 4)]
+    assert solver.cost == pytest.approx(5.6)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_bucket_queue_matches_the_heap(seed):
+    weights = terrain_map(48, seed)
+    free = np.argwhere(weights > 0)
+    rng = np.random.default_rng(seed)
+    bucket = WeightedSolver(weights)
+    heap = HeapWeightedSolver(weights)
+    for start, end in free[rng.integers(0, len(free), size=(10, 2))].tolist():
+        bucket.create_path(tuple(start), tuple(end))
+        heap.create_path(tuple(start), tuple(end))
+        assert bucket.cost == heap.cost
+
+
+def test_weights_out_of_range():
+    with pytest.raises(ValueError):
+        WeightedSolver(np.full((3, 3), 10))
+
+
+def test_weighted_round_trip(tmp_path):
+    weights = terrain_map(40, 1)
+    path = str(tmp_path / 'terrain.gmap')
+    store_map(path, weights, weighted=True)
+    assert map_weighted(path)
+    assert np.array_equal(load_map(path), weights)
+
+
+def test_weighted_maps_are_not_packed(tmp_path):
+    with pytest.raises(ValueError):
+        save_map(str(tmp_path / 'terrain.gmap'), terrain_map(16), packed=True, weighted=True)
+
+
+def test_movingai_keeps_only_the_walls_of_weighted_maps(tmp_path):
+    weights = terrain_map(24, 3)
+    path = str(tmp_path / 'terrain.map')
+    store_map(path, weights, weighted=True)
+    assert np.array_equal(load_map(path), weights > 0)
@@ -0,0 +1,133 @@
+import heapq
+import math
+import time
+from array import array
+
+from line_of_sight import SHORT_LINE, LineOfSight
+from search_stats import SearchStats
+from solver import CLOSED, FREE, Solver
+
+# lines from the parent that are longer by less than this still count as ties
+TOLERANCE = 1e-9
+
+
+class ThetaStarSolver(Solver):
+    # any-angle A* (Theta*): a cell reached from current may take current's
+    # parent as its own when the two can see each other, so paths are straight
+    # lines between a few waypoints instead of cell-by-cell steps. The lines
+    # from a parent to all neighbours of a cell are tested in one vectorized
+    # batch. Costs are euclidean, so the heuristic is too; octile would
+    # overestimate any-angle paths.
+    def __init__(self, matrix):
+        super().__init__(matrix, heuristic='euclidean')
+        self.sight = LineOfSight(matrix)
+
+    def create_path(self, start, end):
+        started = time.perf_counter()
+        self.stats = stats = SearchStats()
+        self.start = start
+        self.end = end
+        self.path = None
+        self.cost = None
+        heuristic = self.heuristic
+        offsets = self.offsets
+        width = self.width
+        position = self.position
+        visible = self.sight.visible
+        visible_from = self.sight.visible_from
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        size = len(self.walkable)
+        self.g_score = g_score = array('d', [math.inf]) * size
+        self.parent = parent = array('i', [-1]) * size
+        self.state = state = bytearray(self.walkable)
+
+        start_index = self.index(start)
+        end_index = self.index(end)
+        end_row, end_col = divmod(end_index, width)
+        start_row, start_col = divmod(start_index, width)
+
+        counter = 0
+        expanded = 0
+        g_score[start_index] = 0.0
+        h = heuristic(abs(start_row - end_row), abs(start_col - end_col))
+        open_heap = [(h, h, counter, start_index)]
+        decreased = 0
+        peak_open = 1
+
+        while open_heap:
+            current = heappop(open_heap)[3]
+            if state[current] == CLOSED:
+                continue
+            state[current] = CLOSED
+            expanded += 1
+
+            if current == end_index:
+                self.cost = g_score[current]
+                path = []
+                while current != -1:
+                    path.append(position(current))
+                    current = parent[current]
+                path.reverse()
+                self.path = path
+                break
+
+            row, col = divmod(current, width)
+            neighbours = [(current + delta, d_row, d_col, step) for delta, d_row, d_col, step in offsets
+                          if state[current + delta] == FREE]
+            if not neighbours:
+                continue
+
+            # path 2 goes straight from the parent of current when it can see
+            # the neighbour; lines are only tested where that would improve g
+            current_g = g_score[current]
+            through = [(current_g + step, current) for _, _, _, step in neighbours]
+            grand = parent[current]
+            if grand != -1:
+                grand_row, grand_col = divmod(grand, width)
+                grand_g = g_score[grand]
+                candidates = []
+                for number, (index, d_row, d_col, _) in enumerate(neighbours):
+                    g = grand_g + math.hypot(row + d_row - grand_row, col + d_col - grand_col)
+                    # ties go to the straight line, which saves a waypoint
+                    if g < g_score[index] and g <= through[number][0] + TOLERANCE:
+                        candidates.append((number, g))
+                if candidates:
+                    grand_cell = (grand_row - 1, grand_col - 1)
+                    ends = [(row + neighbours[number][1] - 1, col + neighbours[number][2] - 1)
+                            for number, _ in candidates]
+                    # short lines one by one, long ones in a single numpy batch
+                    if max(abs(row - grand_row), abs(col - grand_col)) < SHORT_LINE:
+                        sight = [visible(grand_cell, cell) for cell in ends]
+                    else:
+                        sight = visible_from(grand_cell, ends)
+                    for (number, g), seen in zip(candidates, sight):
+                        if seen:
+                            through[number] = (g, grand)
+
+            for (index, d_row, d_col, _), (g, source) in zip(neighbours, through):
+                if g < g_score[index]:
+                    if parent[index] != -1:
+                        decreased += 1
+                    n_row = row + d_row
+                    n_col = col + d_col
+                    g_score[index] = g
+                    parent[index] = source
+                    counter += 1
+                    h = heuristic(abs(n_row - end_row), abs(n_col - end_col))
+                    heappush(open_heap, (round(g + h, 9), h, counter, index))
+            if len(open_heap) > peak_open:
+                peak_open = len(open_heap)
+
+        self.expanded = expanded
+        stats.expanded = expanded
+        stats.generated = counter
+        stats.decreased = decreased
+        stats.stale = counter + 1 - len(open_heap) - expanded
+        stats.peak_open = peak_open
+        stats.heuristic_calls = counter + 1
+        stats.times['search'] = time.perf_counter() - started
+        if self.stats_sink is not None:
+            self.stats_sink(stats)
+        return self.path
@@ -0,0 +1,81 @@
+import math
+
+# pixels per cell when zoomed in; below one pixel per cell the view shows every
+# step-th cell instead
+ZOOM_SIZES = (64, 32, 16, 8, 4, 2, 1)
+
+
+class Viewport:
+    # the part of the board shown in a width x height pixel area: cells are size
+    # pixels wide (1 / step when zoomed out) and (top, left) is the fractional
+    # cell at the top-left corner
+    def __init__(self, rows, cols, width, height, size=16):
+        self.rows = rows
+        self.cols = cols
+        self.width = width
+        self.height = height
+
+        # zoom levels go down until the whole board fits
+        self.sizes = list(ZOOM_SIZES)
+        step = 2
+        while self.sizes[-1] * cols > width or self.sizes[-1] * rows > height:
+            self.sizes.append(1 / step)
+            step *= 2
+        self.level = min(range(len(self.sizes)), key=lambda level: abs(self.sizes[level] - size))
+        self.top = 0.0
+        self.left = 0.0
+        self.clamp()
+
+    @property
+    def size(self):
+        return self.sizes[self.level]
+
+    @property
+    def step(self):
+        return max(1, round(1 / self.size))
+
+    def state(self):
+        # changes whenever the cells on screen move
+        return (self.level, self.top, self.left)
+
+    def clamp(self):
+        self.top = min(max(self.top, 0.0), max(self.rows - self.height / self.size, 0.0))
+        self.left = min(max(self.left, 0.0), max(self.cols - self.width / self.size, 0.0))
+
+    def scroll(self, d_x, d_y):
+        self.left += d_x / self.size
+        self.top += d_y / self.size
+        self.clamp()
+
+    def zoom(self, levels, x, y):
+        # keep the cell under (x, y) in place
+        row = self.top + y / self.size
+        col = self.left + x / self.size
+        self.level = min(max(self.level - levels, 0), len(self.sizes) - 1)
+        self.top = row - y / self.size
+        self.left = col - x / self.size
+        self.clamp()
+
+    def cell_at(self, x, y):
+        # hit-testing for a point of the board area, None off the board
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        row = int(self.top + y / self.size)
+        col = int(self.left + x / self.size)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return (row, col)
+        return None
+
+    def window(self):
+        # (top, left, bottom, right, step) of the cells to draw; zoomed out the
+        # window starts on a multiple of step so the sampled cells stay put
+        step = self.step
+        top = int(self.top) // step * step
+        left = int(self.left) // step * step
+        bottom = min(self.rows, math.ceil(self.top + self.height / self.size))
+        right = min(self.cols, math.ceil(self.left + self.width / self.size))
+        return top, left, bottom, right, step
+
+    def origin(self, top, left):
+        # pixel position of cell (top, left) in the board area
+        return (round((left - self.left) * self.size), round((top - self.top) * self.size))
@@ -0,0 +1,189 @@
+import heapq
+import math
+from array import array
+
+import numpy as np
+
+from solver import NEIGHBOURS
+
+# weighted maps hold the cost of entering each cell: 0 is blocked and
+# 1..MAX_WEIGHT are terrain weights. Steps are measured in tenths of a cell,
+# 10 straight and 14 diagonal, so every cost is a small integer.
+MAX_WEIGHT = 9
+SCALE = 10
+STEPS = {1: 10, 2: 14}
+
+
+def integer_octile(d_row, d_col):
+    # octile distance in the same integer units, exact on a map of weight 1
+    if d_row < d_col:
+        return SCALE * d_col + (STEPS[2] - SCALE) * d_row
+    return SCALE * d_row + (STEPS[2] - SCALE) * d_col
+
+
+class WeightedSolver:
+    # A* on integer costs with a bucket queue (Dial): open cells are kept in a
+    # ring of lists indexed by f, so pushing and popping are O(1) list
+    # operations instead of O(log n) heap ones. With a consistent heuristic f
+    # never drops and never jumps by more than the most expensive step plus
+    # the largest change of h, so a ring of that many buckets is enough.
+    def __init__(self, weights):
+        weights = np.asarray(weights)
+        if weights.min(initial=0) < 0 or weights.max(initial=0) > MAX_WEIGHT:
+            raise ValueError(f'weights must be between 0 and {MAX_WEIGHT}')
+        self.rows, self.cols = weights.shape
+        self.width = self.cols + 2
+        padded = np.zeros((self.rows + 2, self.width), dtype=np.uint8)
+        padded[1:-1, 1:-1] = weights
+        self.weights = padded.tobytes()
+        self.offsets = [(d_row * self.width + d_col, d_row, d_col, STEPS[abs(d_row) + abs(d_col)])
+                        for d_row, d_col, _ in NEIGHBOURS]
+        self.ring = STEPS[2] * MAX_WEIGHT + STEPS[2] + 1
+
+        self.cost = None
+        self.expanded = 0
+        self.g_score = None
+        self.parent = None
+
+    def index(self, position):
+        return (position[0] + 1) * self.width + position[1] + 1
+
+    def position(self, index):
+        row, col = divmod(index, self.width)
+        return (row - 1, col - 1)
+
+    def reset(self, start, end):
+        self.cost = None
+        self.expanded = 0
+        size = len(self.weights)
+        self.g_score = array('q', [-1]) * size
+        self.parent = array('i', [-1]) * size
+        self.closed = bytearray(size)
+        return self.index(start), self.index(end)
+
+    def build_path(self, current):
+        path = []
+        while current != -1:
+            path.append(self.position(current))
+            current = self.parent[current]
+        path.reverse()
+        return path
+
+    def create_path(self, start, end):
+        start_index, end_index = self.reset(start, end)
+        weights = self.weights
+        offsets = self.offsets
+        width = self.width
+        g_score = self.g_score
+        parent = self.parent
+        closed = self.closed
+        ring = self.ring
+        if not weights[start_index] or not weights[end_index]:
+            return None
+
+        end_row, end_col = divmod(end_index, width)
+        start_row, start_col = divmod(start_index, width)
+        buckets = [[] for _ in range(ring)]
+        f = integer_octile(abs(start_row - end_row), abs(start_col - end_col))
+        g_score[start_index] = 0
+        buckets[f % ring].append(start_index)
+        pending = 1
+        expanded = 0
+
+        while pending:
+            bucket = buckets[f % ring]
+            if not bucket:
+                f += 1
+                continue
+            # newest first, which favours the deepest cells among equal f
+            current = bucket.pop()
+            pending -= 1
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+            if current == end_index:
+                self.expanded = expanded
+                self.cost = g_score[current] / SCALE
+                return self.build_path(current)
+
+            row, col = divmod(current, width)
+            current_g = g_score[current]
+            for delta, d_row, d_col, step in offsets:
+                index = current + delta
+                weight = weights[index]
+                if not weight or closed[index]:
+                    continue
+                g = current_g + step * weight
+                if g < g_score[index] or g_score[index] < 0:
+                    g_score[index] = g
+                    parent[index] = current
+                    n_row = row + d_row
+                    n_col = col + d_col
+                    d_row_end = n_row - end_row if n_row > end_row else end_row - n_row
+                    d_col_end = n_col - end_col if n_col > end_col else end_col - n_col
+                    buckets[(g + integer_octile(d_row_end, d_col_end)) % ring].append(index)
+                    pending += 1
+
+        self.expanded = expanded
+        return None
+
+
+class HeapWeightedSolver(WeightedSolver):
+    # the same search with a binary heap, for comparison
+    def create_path(self, start, end):
+        start_index, end_index = self.reset(start, end)
+        weights = self.weights
+        offsets = self.offsets
+        width = self.width
+        g_score = self.g_score
+        parent = self.parent
+        closed = self.closed
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        if not weights[start_index] or not weights[end_index]:
+            return None
+
+        end_row, end_col = divmod(end_index, width)
+        start_row, start_col = divmod(start_index, width)
+        g_score[start_index] = 0
+        # ties on f go to the deeper cell, as in the bucket queue
+        open_heap = [(integer_octile(abs(start_row - end_row), abs(start_col - end_col)), 0, start_index)]
+        expanded = 0
+
+        while open_heap:
+            current = heappop(open_heap)[2]
+            if closed[current]:
+                continue
+            closed[current] = 1
+            expanded += 1
+            if current == end_index:
+                self.expanded = expanded
+                self.cost = g_score[current] / SCALE
+                return self.build_path(current)
+
+            row, col = divmod(current, width)
+            current_g = g_score[current]
+            for delta, d_row, d_col, step in offsets:
+                index = current + delta
+                weight = weights[index]
+                if not weight or closed[index]:
+                    continue
+                g = current_g + step * weight
+                if g < g_score[index] or g_score[index] < 0:
+                    g_score[index] = g
+                    parent[index] = current
+                    h = integer_octile(abs(row + d_row - end_row), abs(col + d_col - end_col))
+                    heappush(open_heap, (g + h, -g, index))
+
+        self.expanded = expanded
+        return None
+
+
+def weighted_path_cost(weights, path):
+    # cost of a path in cell units under the weighted step rules
+    weights = np.asarray(weights)
+    total = 0
+    for (row, col), (n_row, n_col) in zip(path, path[1:]):
+        total += STEPS[abs(n_row - row) + abs(n_col - col)] * int(weights[n_row, n_col])
+    return total / SCALE if path else math.nan